@@ -4,8 +4,23 @@ Copilot Chat History Exporter
 A tool to export chat history from GitHub Copilot Chat in VS Code.
 """
 
-from copilot_chat_exporter.core.models import ChatMessage, ChatSession
-from copilot_chat_exporter.core.exporter import CopilotChatExporter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from copilot_chat_exporter.core.models import ChatMessage, ChatSession
+    from copilot_chat_exporter.core.exporter import CopilotChatExporter
 
 __version__ = "0.1.0"
 __all__ = ["CopilotChatExporter", "ChatMessage", "ChatSession"]
+
+
+def __getattr__(name):
+    # Import the public classes on first access so the CLIs can parse their
+    # arguments (and answer --help) without loading pydantic and sqlite3
+    if name in ("ChatMessage", "ChatSession"):
+        from copilot_chat_exporter.core import models
+        return getattr(models, name)
+    if name == "CopilotChatExporter":
+        from copilot_chat_exporter.core.exporter import CopilotChatExporter
+        return CopilotChatExporter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,16 +4,17 @@ Main CLI entry point for Copilot Chat Exporter
 """
 
 import argparse
-from datetime import datetime
-from pathlib import Path
-
-from copilot_chat_exporter.core.exporter import CopilotChatExporter
+import logging
+import os
+import sys
+import time
+from itertools import chain, islice
 
 
 def main():
     """Main entry point for the CLI"""
     parser = argparse.ArgumentParser(description='Export Copilot Chat History')
-    parser.add_argument('--format', choices=['json', 'csv', 'markdown'], default='json',
+    parser.add_argument('--format', choices=['json', 'jsonl', 'csv', 'markdown'], default='json',
                        help='Export format (default: json)')
     parser.add_argument('--output', '-o', help='Output file path')
     parser.add_argument('--workspace', '-w', help='Workspace path (default: current directory)')
@@ -21,18 +22,29 @@ def main():
     
     args = parser.parse_args()
     
+    # Progress messages from the exporter; --verbose adds the discovery details
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format='%(message)s')
+    
+    # Imported after argument parsing so --help and usage errors stay fast
+    from copilot_chat_exporter.core.exporter import CopilotChatExporter
+    from copilot_chat_exporter.core.writers import get_writer
+    from copilot_chat_exporter.utils.memory import paused_gc
+    
+    workspace_path = args.workspace or os.getcwd()
+    
     # Set default output filename based on format
     if not args.output:
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        workspace_name = Path(args.workspace or Path.cwd()).name
+        timestamp = time.strftime('%Y%m%d_%H%M%S')
+        workspace_name = os.path.basename(os.path.normpath(workspace_path))
         args.output = f"copilot_chat_{workspace_name}_{timestamp}.{args.format}"
     
-    exporter = CopilotChatExporter(workspace_path=args.workspace)
+    exporter = CopilotChatExporter(workspace_path=workspace_path)
     
     print("Extracting chat history...")
-    sessions = exporter.extract_chat_history()
+    sessions = exporter.iter_chat_history()
+    first_session = next(sessions, None)
     
-    if not sessions:
+    if first_session is None:
         print("No chat history found. This could be because:")
         print("1. Copilot chat database is in a different location")
         print("2. Chat history is stored in a different format")
@@ -44,25 +56,30 @@ def main():
             print(f"   No workspace ID found for: {exporter.workspace_path}")
         return
     
-    print(f"Found {len(sessions)} chat sessions with {sum(len(s.messages) for s in sessions)} total messages")
+    # Stream every session into the writer in a single pass; verbose
+    # details are collected and written to stdout in one go at the end
+    verbose_lines = []
+    
+    with get_writer(args.format, args.output) as writer, paused_gc():
+        for session in chain([first_session], sessions):
+            writer.write(session)
+            
+            if args.verbose:
+                verbose_lines.append(
+                    f"Session: {session.session_id}\n"
+                    f"  Title: {session.title}\n"
+                    f"  Messages: {len(session.messages)}\n"
+                )
+                for msg in islice(session.messages, 3):  # Show first 3 messages
+                    verbose_lines.append(f"    {msg.role}: {msg.content[:100]}...\n")
+    
+    print(f"Found {writer.session_count} chat sessions with {writer.message_count} total messages")
     if exporter.workspace_id:
         print(f"Workspace ID: {exporter.workspace_id}")
+    print(f"Exported to {args.output}")
     
-    # Export based on format
-    if args.format == 'json':
-        exporter.export_to_json(sessions, args.output)
-    elif args.format == 'csv':
-        exporter.export_to_csv(sessions, args.output)
-    elif args.format == 'markdown':
-        exporter.export_to_markdown(sessions, args.output)
-    
-    if args.verbose:
-        for session in sessions:
-            print(f"Session: {session.session_id}")
-            print(f"  Title: {session.title}")
-            print(f"  Messages: {len(session.messages)}")
-            for msg in session.messages[:3]:  # Show first 3 messages
-                print(f"    {msg.role}: {msg.content[:100]}...")
+    if verbose_lines:
+        sys.stdout.write(''.join(verbose_lines))
 
 
 if __name__ == "__main__":
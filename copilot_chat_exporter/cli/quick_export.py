@@ -3,11 +3,15 @@
 Quick export utility for Copilot Chat history
 """
 
+import logging
+import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from datetime import datetime
+from itertools import chain
 
-from copilot_chat_exporter.core.exporter import CopilotChatExporter
+from copilot_chat_exporter.config import format_timestamp
 
 
 def quick_export(workspace_path=None):
@@ -17,19 +21,26 @@ def quick_export(workspace_path=None):
     
     workspace_display = workspace_path or "current directory"
     print(f"📁 Workspace: {workspace_display}")
+    workspace_path = workspace_path or os.getcwd()
     
     # Create exports directory if it doesn't exist
     exports_dir = Path("exports")
     exports_dir.mkdir(exist_ok=True)
     
+    # Imported here so the help command does not load the exporter
+    from copilot_chat_exporter.core.exporter import CopilotChatExporter
+    from copilot_chat_exporter.core.writers import get_writer
+    from copilot_chat_exporter.utils.memory import paused_gc
+    
     # Initialize exporter
     exporter = CopilotChatExporter(workspace_path=workspace_path)
     
     # Extract chat history
     print("📦 Extracting chat history...")
-    sessions = exporter.extract_chat_history()
+    sessions = exporter.iter_chat_history()
+    first_session = next(sessions, None)
     
-    if not sessions:
+    if first_session is None:
         print("❌ No chat history found!")
         print("\nPossible reasons:")
         print("• Copilot chat hasn't been used yet")
@@ -42,40 +53,85 @@ def quick_export(workspace_path=None):
             print(f"• No workspace ID found for: {exporter.workspace_path}")
         return
     
-    total_messages = sum(len(session.messages) for session in sessions)
-    print(f"✅ Found {len(sessions)} sessions with {total_messages} messages")
-    if exporter.workspace_id:
-        print(f"🔑 Workspace ID: {exporter.workspace_id}")
-    
     # Generate timestamp for filenames
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    workspace_name = Path(workspace_path or Path.cwd()).name
+    timestamp = time.strftime('%Y%m%d_%H%M%S')
+    workspace_name = os.path.basename(os.path.normpath(workspace_path))
     
     # Export to multiple formats
-    formats = ['json', 'markdown', 'csv']
+    formats = ['jsonl', 'json', 'markdown', 'csv']
+    writers = {}
     
     for fmt in formats:
         filename = exports_dir / f"copilot_chat_{workspace_name}_{timestamp}.{fmt}"
+        writer = get_writer(fmt, str(filename))
         
         try:
-            if fmt == 'json':
-                exporter.export_to_json(sessions, str(filename))
-            elif fmt == 'markdown':
-                exporter.export_to_markdown(sessions, str(filename))
-            elif fmt == 'csv':
-                exporter.export_to_csv(sessions, str(filename))
-            
-            print(f"📄 Exported to {filename}")
-            
+            writer.open()
+            writers[fmt] = writer
         except Exception as e:
             print(f"❌ Failed to export {fmt}: {e}")
+            _close_quietly(writer)
+    
+    # Stream every session into all writers in a single pass. Each format
+    # targets its own file, so the writes run concurrently, and the next
+    # session is extracted while the previous one is still being written;
+    # a failing format is dropped without interrupting the others
+    session_count = 0
+    message_count = 0
+    
+    with ThreadPoolExecutor(max_workers=len(formats)) as executor, paused_gc():
+        pending = {}
+        
+        for session in chain([first_session], sessions):
+            _wait_for_writes(pending, writers)
+            
+            session_count += 1
+            message_count += len(session.messages)
+            
+            pending = {executor.submit(writer.write, session): fmt for fmt, writer in writers.items()}
+        
+        _wait_for_writes(pending, writers)
+        
+        print(f"✅ Found {session_count} sessions with {message_count} messages")
+        if exporter.workspace_id:
+            print(f"🔑 Workspace ID: {exporter.workspace_id}")
+        
+        futures = {executor.submit(writer.close): fmt for fmt, writer in writers.items()}
+        for future in as_completed(futures):
+            fmt = futures[future]
+            try:
+                future.result()
+                print(f"📄 Exported to {writers[fmt].output_path}")
+            except Exception as e:
+                print(f"❌ Failed to export {fmt}: {e}")
     
     print("\n🎉 Export completed!")
     print(f"📁 Files saved in: {exports_dir.absolute()}")
 
 
+def _wait_for_writes(futures, writers):
+    """Wait for pending writes, dropping the writer of any format that failed"""
+    for future in as_completed(futures):
+        fmt = futures[future]
+        try:
+            future.result()
+        except Exception as e:
+            print(f"❌ Failed to export {fmt}: {e}")
+            _close_quietly(writers.pop(fmt))
+
+
+def _close_quietly(writer):
+    """Close a writer that already failed, ignoring further errors"""
+    try:
+        writer.close()
+    except Exception:
+        pass
+
+
 def show_stats(workspace_path=None):
     """Show statistics about the chat history"""
+    from copilot_chat_exporter.core.exporter import CopilotChatExporter
+    
     exporter = CopilotChatExporter(workspace_path=workspace_path)
     sessions = exporter.extract_chat_history()
     
@@ -87,8 +143,19 @@ def show_stats(workspace_path=None):
             print(f"No workspace ID found for: {exporter.workspace_path}")
         return
     
-    total_messages = sum(len(session.messages) for session in sessions)
-    user_messages = sum(len([m for m in session.messages if m.role == 'user']) for session in sessions)
+    # Count everything and find the oldest/newest sessions in a single pass
+    total_messages = 0
+    user_messages = 0
+    oldest_session = newest_session = sessions[0]
+    for session in sessions:
+        if session.created_at < oldest_session.created_at:
+            oldest_session = session
+        if session.updated_at > newest_session.updated_at:
+            newest_session = session
+        
+        total_messages += len(session.messages)
+        for message in session.messages:
+            user_messages += message.role == 'user'
     assistant_messages = total_messages - user_messages
     
     print("📊 Chat History Statistics")
@@ -102,11 +169,8 @@ def show_stats(workspace_path=None):
     print(f"Assistant Messages: {assistant_messages}")
     
     if sessions:
-        oldest_session = min(sessions, key=lambda s: s.created_at)
-        newest_session = max(sessions, key=lambda s: s.updated_at)
-        
-        print(f"Oldest Session: {oldest_session.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Newest Session: {newest_session.updated_at.strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"Oldest Session: {format_timestamp(oldest_session.created_at)}")
+        print(f"Newest Session: {format_timestamp(newest_session.updated_at)}")
         
         # Show session details
         print("\n📝 Session Details:")
@@ -117,6 +181,7 @@ def show_stats(workspace_path=None):
 
 def main():
     """Main entry point"""
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     workspace_path = None
     
     # Simple argument parsing
@@ -3,11 +3,10 @@
 VS Code Workspace ID Finder CLI
 """
 
+import os
 import sys
 import argparse
-from pathlib import Path
-
-from copilot_chat_exporter.utils.workspace_finder import VSCodeWorkspaceFinder
+import logging
 
 
 def main():
@@ -22,13 +21,20 @@ def main():
     
     args = parser.parse_args()
     
-    finder = VSCodeWorkspaceFinder()
+    # The finder logs its details; --verbose shows them alongside the result
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+    
+    # Imported after argument parsing so --help doesn't pay for it
+    from copilot_chat_exporter.utils.workspace_finder import VSCodeWorkspaceFinder
+    
+    # Keep the folders read from workspace.json files for the next run
+    finder = VSCodeWorkspaceFinder(cache_dir=VSCodeWorkspaceFinder.default_cache_dir())
     
     if args.list:
         print("📋 All VS Code Workspaces:")
         print("=" * 50)
         
-        workspaces = finder.list_all_workspaces()
+        workspaces = finder.list_all_workspaces(check_existence=True)
         
         if not workspaces:
             print("No workspaces found.")
@@ -43,12 +49,13 @@ def main():
         print(f"Total: {len(workspaces)} workspaces")
         return
     
-    # Find workspace ID for specific folder
-    folder_path = Path(args.folder_path).resolve()
+    # Find workspace ID for specific folder. Making the path absolute is
+    # enough here; the finder resolves symlinks itself when comparing
+    folder_path = os.path.abspath(args.folder_path)
     
     print(f"🔍 Finding workspace ID for: {folder_path}")
     
-    workspace_id = finder.find_workspace_id(str(folder_path), verbose=args.verbose)
+    workspace_id = finder.find_workspace_id(folder_path, verbose=args.verbose)
     
     if workspace_id:
         print(f"✅ Workspace ID found: {workspace_id}")
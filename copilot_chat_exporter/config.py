@@ -1,5 +1,7 @@
 """Configuration settings for Copilot Chat Exporter."""
 
+from datetime import datetime
+
 # Export settings
 EXPORT_FORMAT = "json"  # Options: json, csv, markdown
 OUTPUT_DIRECTORY = "exports"
@@ -14,12 +16,17 @@ CUSTOM_DB_PATHS = [
 
 # Export filters
 FILTER_BY_DATE = False
-START_DATE = "2024-01-01"
-END_DATE = "2024-12-31"
+START_DATE = datetime.fromisoformat("2024-01-01")
+END_DATE = datetime.fromisoformat("2024-12-31")
 
 FILTER_BY_ROLE = False
-INCLUDE_ROLES = ["user", "assistant"]  # Options: user, assistant
+INCLUDE_ROLES = frozenset({"user", "assistant"})  # Options: user, assistant
 
 # Output formatting
 MAX_MESSAGE_LENGTH = None  # Set to limit message length in export
 TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def format_timestamp(timestamp: datetime) -> str:
+    """Format a timestamp for display using TIMESTAMP_FORMAT"""
+    return timestamp.strftime(TIMESTAMP_FORMAT)
@@ -6,16 +6,131 @@ and exports it to various formats.
 """
 
 import json
+import logging
 import sqlite3
 import os
+import re
 import sys
-import urllib.parse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-import csv
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple, Callable, Collection, TextIO, Union
 
 from copilot_chat_exporter.core.models import ChatMessage, ChatSession
+from copilot_chat_exporter.core.writers import (
+    SessionWriter,
+    JsonSessionWriter,
+    JsonlSessionWriter,
+    CsvSessionWriter,
+    MarkdownSessionWriter,
+)
+from copilot_chat_exporter.utils.workspace_finder import VSCodeWorkspaceFinder
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # optional speedup, fall back to the standard library
+    _json_loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+# File extensions of SQLite databases that may hold chat history
+_DATABASE_EXTENSIONS = frozenset({'.db', '.sqlite', '.sqlite3', '.vscdb'})
+
+# Extensions of files that may hold chat data
+_DATA_EXTENSIONS = _DATABASE_EXTENSIONS | {'.json', '.data'}
+
+# Matches file names containing common chat-related keywords
+_CHAT_FILE_PATTERN = re.compile(
+    'chat|copilot|conversation|message|session|github|ai|assistant|dialog'
+)
+
+# Column name fragments identifying the message content, role and timestamp
+_CONTENT_COLUMN_KEYWORDS = ('content', 'message', 'text')
+_ROLE_COLUMN_KEYWORDS = ('role', 'type', 'sender')
+_TIMESTAMP_COLUMN_KEYWORDS = ('time', 'date')
+
+# Numeric timestamps above this are in milliseconds rather than seconds
+_EPOCH_MS_THRESHOLD = 1e10
+
+# Every SQLite database file starts with this header
+_SQLITE_HEADER = b'SQLite format 3\x00'
+
+# Number of threads probing candidate databases at once
+_PROBE_WORKERS = 8
+
+# Table name fragments that suggest a database holds chat data
+_CHAT_TABLE_INDICATORS = ('chat', 'message', 'conversation', 'copilot', 'session')
+
+# Matches the first table whose name contains any of the indicators
+_CHAT_PROBE_SQL = (
+    "SELECT 1 FROM sqlite_master WHERE type='table' AND ("
+    + " OR ".join(f"lower(name) LIKE '%{indicator}%'" for indicator in _CHAT_TABLE_INDICATORS)
+    + ") LIMIT 1"
+)
+
+
+def _matching_columns(columns_lower: List[str], keywords: Tuple[str, ...]) -> Tuple[int, ...]:
+    """Indexes of the columns whose name contains a keyword, last column first"""
+    return tuple(
+        i for i in reversed(range(len(columns_lower)))
+        if any(keyword in columns_lower[i] for keyword in keywords)
+    )
+
+
+def _parse_numeric_timestamp(value: Any) -> Optional[datetime]:
+    """Parse a Unix timestamp in seconds or milliseconds"""
+    try:
+        return datetime.fromtimestamp(value / 1000 if value > _EPOCH_MS_THRESHOLD else value)
+    except TypeError:
+        return _parse_timestamp(value)
+    except (ValueError, OverflowError, OSError):
+        return None
+
+
+def _parse_iso_timestamp(value: Any) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp, including a trailing 'Z'"""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (TypeError, AttributeError):
+        return _parse_timestamp(value)
+    except ValueError:
+        return None
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    """Parse a timestamp of any supported type"""
+    if isinstance(value, (int, float)):
+        return _parse_numeric_timestamp(value)
+    if isinstance(value, str):
+        return _parse_iso_timestamp(value)
+    return None
+
+
+def _timestamp_parser(declared_type: str) -> Callable[[Any], Optional[datetime]]:
+    """Pick a timestamp parser from a column's declared SQLite type
+    
+    Follows SQLite's type affinity rules. SQLite does not enforce column
+    types, so each parser still hands unexpected values to _parse_timestamp.
+    """
+    declared_type = declared_type.upper()
+    if 'INT' in declared_type:
+        return _parse_numeric_timestamp
+    if 'CHAR' in declared_type or 'CLOB' in declared_type or 'TEXT' in declared_type:
+        return _parse_iso_timestamp
+    if 'REAL' in declared_type or 'FLOA' in declared_type or 'DOUB' in declared_type:
+        return _parse_numeric_timestamp
+    return _parse_timestamp
+
+
+def _output_name(output_path: Union[str, TextIO]) -> str:
+    """Name of an export destination for log messages"""
+    if isinstance(output_path, str):
+        return output_path
+    # Open files carry their path; in-memory streams have no name
+    return getattr(output_path, 'name', 'the given stream')
 
 
 class CopilotChatExporter:
@@ -26,12 +141,27 @@ class CopilotChatExporter:
         self.workspace_path = workspace_path or str(Path.cwd())
         self.workspace_id = None
         self.chat_db_path = None
+        self._chat_conn: Optional[sqlite3.Connection] = None
         
         # Find workspace ID first, then look for database
         self.workspace_id = self._find_workspace_id()
         self._find_chat_database()
     
-    def _find_vscode_data_directory(self) -> Path:
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Close the database connection kept from probing, if no extraction used it"""
+        if self._chat_conn is not None:
+            self._chat_conn.close()
+            self._chat_conn = None
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _find_vscode_data_directory() -> Path:
         """Find VS Code data directory based on the operating system"""
         if sys.platform == "win32":
             # Windows
@@ -47,103 +177,41 @@ class CopilotChatExporter:
     
     def _find_workspace_id(self) -> Optional[str]:
         """Find VS Code workspace ID for the given workspace path"""
-        try:
-            # Normalize the input folder path
-            input_path = Path(self.workspace_path).resolve()
-            normalized_input_path = input_path.as_posix().lower()
-            print(f"Looking for workspace ID for: {self.workspace_path}")
-            print(f"Normalized path: {normalized_input_path}")
-            
-            # Get workspace storage path
-            workspace_storage_path = self.vscode_data_dir / "User" / "workspaceStorage"
-            
-            if not workspace_storage_path.exists():
-                print(f"Workspace storage path does not exist: {workspace_storage_path}")
-                return None
-            
-            print(f"Searching in workspace storage: {workspace_storage_path}")
-            
-            # Iterate through each workspace ID directory
-            workspace_directories = list(workspace_storage_path.iterdir())
-            print(f"Found {len(workspace_directories)} workspace directories to check")
-            
-            for directory in workspace_directories:
-                if not directory.is_dir():
-                    continue
-                    
-                workspace_id = directory.name
-                workspace_json_path = directory / 'workspace.json'
-                
-                if workspace_json_path.exists():
-                    try:
-                        with open(workspace_json_path, 'r', encoding='utf-8') as f:
-                            json_content = json.load(f)
-                        
-                        if json_content.get('folder'):
-                            # Handle URL format workspace paths properly
-                            workspace_folder_path = json_content['folder']
-                            
-                            # Remove file:// protocol prefix
-                            if workspace_folder_path.startswith('file://'):
-                                workspace_folder_path = workspace_folder_path[7:]  # Remove 'file://'
-                            
-                            # URL decode the path (handle %3a, %20, etc.)
-                            workspace_folder_path = urllib.parse.unquote(workspace_folder_path)
-                            
-                            # Handle Windows paths that start with /c:/ pattern
-                            if sys.platform == "win32" and workspace_folder_path.startswith('/') and ':' in workspace_folder_path:
-                                # Remove leading slash for Windows paths like /c:/path
-                                workspace_folder_path = workspace_folder_path[1:]
-                            
-                            # Normalize the workspace path for comparison
-                            try:
-                                workspace_path = Path(workspace_folder_path)
-                                
-                                # Skip remote paths (they won't resolve properly)
-                                if workspace_folder_path.startswith(('vscode-remote://', 'wsl.localhost')):
-                                    continue
-                                
-                                # Try to resolve the path, if it fails, use as-is
-                                try:
-                                    normalized_workspace_path = workspace_path.resolve().as_posix().lower()
-                                except (OSError, ValueError):
-                                    normalized_workspace_path = workspace_path.as_posix().lower()
-                                
-                                if normalized_workspace_path == normalized_input_path:
-                                    print(f"✅ Found workspace ID: {workspace_id}")
-                                    print(f"📁 Workspace path: {workspace_folder_path}")
-                                    return workspace_id
-                                    
-                            except Exception as e:
-                                print(f"Error normalizing workspace path '{workspace_folder_path}': {e}")
-                                continue
-                                
-                    except Exception as e:
-                        print(f"Error parsing workspace.json for ID {workspace_id}: {e}")
-                        continue
-            
-            print("❌ Workspace ID not found for the specified folder path")
-            return None
-            
-        except Exception as e:
-            print(f"Error finding workspace ID: {e}")
-            return None
+        # The finder logs the details of the search to this module's logger
+        finder = VSCodeWorkspaceFinder(logger=logger)
+        finder.vscode_data_dir = self.vscode_data_dir
+        
+        workspace_id = finder.find_workspace_id(self.workspace_path)
+        if workspace_id:
+            logger.info("✅ Found workspace ID: %s", workspace_id)
+            logger.info("📁 Workspace path: %s", self.workspace_path)
+            return workspace_id
+        
+        logger.info("❌ Workspace ID not found for the specified folder path")
+        return None
     
     def _find_chat_database(self):
         """Find the Copilot chat database file"""
+        # Directories already searched, so the generic walk below skips them
+        searched = set()
+        
         # If we have a workspace ID, look in the specific workspace storage first
         if self.workspace_id:
             workspace_specific_path = self.vscode_data_dir / "User" / "workspaceStorage" / self.workspace_id
-            print(f"🔍 Looking for chat database in workspace-specific storage: {workspace_specific_path}")
+            logger.debug("🔍 Looking for chat database in workspace-specific storage: %s", workspace_specific_path)
             
-            if workspace_specific_path.exists():
-                # Look for chat-related files in the workspace storage
-                for db_file in workspace_specific_path.rglob("*"):
-                    if db_file.is_file() and self._is_potential_chat_file(db_file):
-                        if self._is_chat_database(db_file):
-                            self.chat_db_path = db_file
-                            print(f"✅ Found workspace-specific chat database: {db_file}")
-                            return
+            # Look for chat-related files in the workspace storage
+            db_file = self._find_first_chat_database(
+                Path(entry.path) for entry in self._iter_files(workspace_specific_path)
+                if self._is_potential_chat_file(entry.name)
+            )
+            if db_file:
+                self.chat_db_path = db_file
+                logger.info("✅ Found workspace-specific chat database: %s", db_file)
+                return
+            
+            # Every database file there was probed above
+            searched.add(str(workspace_specific_path))
         
         # Common locations for VS Code extensions data
         possible_paths = [
@@ -154,127 +222,227 @@ class CopilotChatExporter:
             Path("db"),
         ]
         
-        for base_path in possible_paths:
-            if base_path.exists():
-                # Look for database files
-                for db_file in base_path.rglob("*.db"):
-                    if self._is_chat_database(db_file):
-                        self.chat_db_path = db_file
-                        print(f"Found chat database: {db_file}")
-                        return
-                
-                # Look for SQLite files
-                for db_file in base_path.rglob("*.sqlite*"):
-                    if self._is_chat_database(db_file):
-                        self.chat_db_path = db_file
-                        print(f"Found chat database: {db_file}")
-                        return
-                
-                # Look for vscdb files (VS Code database format)
-                for db_file in base_path.rglob("*.vscdb"):
-                    if self._is_chat_database(db_file):
-                        self.chat_db_path = db_file
-                        print(f"Found chat database: {db_file}")
-                        return
+        # Look for database, SQLite and vscdb (VS Code database format)
+        # files in a single walk of each location
+        db_file = self._find_first_chat_database(
+            Path(entry.path)
+            for base_path in possible_paths
+            for entry in self._iter_files(base_path, exclude=searched)
+            if os.path.splitext(entry.name)[1].lower() in _DATABASE_EXTENSIONS
+        )
+        if db_file:
+            self.chat_db_path = db_file
+            logger.info("Found chat database: %s", db_file)
     
-    def _is_potential_chat_file(self, file_path: Path) -> bool:
-        """Check if a file might contain chat data based on its name or extension"""
-        filename = file_path.name.lower()
-        extension = file_path.suffix.lower()
+    def _find_first_chat_database(self, candidates: Iterable[Path]) -> Optional[Path]:
+        """Return the first candidate that is a chat database
         
-        # Check for common chat-related file patterns
-        chat_patterns = [
-            'chat', 'copilot', 'conversation', 'message', 'session',
-            'github', 'ai', 'assistant', 'dialog'
-        ]
+        The candidates are probed concurrently, but the result respects their
+        order. At most one probe per worker is in flight, so the walk producing
+        the candidates stops as soon as the earliest pending probe matches.
+        The connection opened for the match is kept for the extraction.
+        """
+        found = None
+        window = deque()
         
-        # Check for common database/data file extensions
-        data_extensions = ['.db', '.sqlite', '.sqlite3', '.vscdb', '.json', '.data']
+        with ThreadPoolExecutor(max_workers=_PROBE_WORKERS) as executor:
+            try:
+                for db_file in candidates:
+                    window.append((db_file, executor.submit(self._is_chat_database, db_file)))
+                    if len(window) >= _PROBE_WORKERS:
+                        found = self._next_probe_result(window)
+                        if found:
+                            break
+                
+                while found is None and window:
+                    found = self._next_probe_result(window)
+            finally:
+                for _, future in window:
+                    if not future.cancel():
+                        # Probed already; release the connection of a later match
+                        is_chat, conn = future.result()
+                        if conn is not None:
+                            conn.close()
         
-        # File might be chat-related if:
-        # 1. Filename contains chat-related keywords
-        # 2. Has a data file extension
-        has_chat_keyword = any(pattern in filename for pattern in chat_patterns)
-        has_data_extension = extension in data_extensions
+        return found
+    
+    def _next_probe_result(self, window: deque) -> Optional[Path]:
+        """Wait for the earliest pending probe and return its file if it matched"""
+        db_file, future = window.popleft()
+        is_chat, conn = future.result()
+        if not is_chat:
+            return None
+        self._chat_conn = conn
+        return db_file
+    
+    @staticmethod
+    def _iter_files(root, exclude: Collection[str] = ()) -> Iterator[os.DirEntry]:
+        """Recursively yield the regular files under root
         
-        return has_chat_keyword or has_data_extension
+        Uses os.scandir so file type checks come from the directory listing
+        instead of a stat() per entry. Symlinks are not followed,
+        unreadable directories are skipped, and so are the directory paths
+        in exclude.
+        """
+        directories = [str(root)]
+        while directories:
+            try:
+                with os.scandir(directories.pop()) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.path not in exclude:
+                                    directories.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                yield entry
+                        except OSError:
+                            continue
+            except OSError:
+                continue
     
-    def _is_chat_database(self, db_path: Path) -> bool:
-        """Check if a database file contains chat data"""
+    def _is_potential_chat_file(self, filename: str) -> bool:
+        """Check if a file might contain chat data based on its name or extension"""
+        filename = filename.lower()
+        
+        # File might be chat-related if:
+        # 1. Has a data file extension
+        # 2. Filename contains chat-related keywords
+        return (
+            os.path.splitext(filename)[1] in _DATA_EXTENSIONS
+            or _CHAT_FILE_PATTERN.search(filename) is not None
+        )
+    
+    @staticmethod
+    def _open_database(db_path: Path) -> sqlite3.Connection:
+        """Open a SQLite database read-only, tuned for the scans done here"""
+        # mode=ro avoids creating journal/lock files next to the database
+        # Probes run in worker threads; each connection is still only used by
+        # one thread at a time
+        conn = sqlite3.connect(
+            f"{Path(db_path).absolute().as_uri()}?mode=ro", uri=True, check_same_thread=False
+        )
+        conn.execute("PRAGMA query_only = 1")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA mmap_size = 268435456")
+        return conn
+    
+    def _is_chat_database(self, db_path: Path) -> Tuple[bool, Optional[sqlite3.Connection]]:
+        """Check if a database file contains chat data
+        
+        For a chat database, the open connection is returned as well so it
+        can be reused for the extraction; otherwise it is closed.
+        """
+        # Empty files, JSON files and anything else that is not SQLite are
+        # rejected from their first bytes without opening a connection
         try:
-            conn = sqlite3.connect(str(db_path))
-            cursor = conn.cursor()
-            
-            # Get table names
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-            tables = [row[0] for row in cursor.fetchall()]
-            
-            # Look for tables that might contain chat data
-            chat_indicators = ['chat', 'message', 'conversation', 'copilot', 'session']
+            with open(db_path, 'rb') as db_file:
+                if db_file.read(len(_SQLITE_HEADER)) != _SQLITE_HEADER:
+                    return False, None
+        except OSError:
+            return False, None
+        
+        conn = None
+        try:
+            conn = self._open_database(db_path)
             
-            for table in tables:
-                if any(indicator in table.lower() for indicator in chat_indicators):
-                    conn.close()
-                    return True
+            # Look for a table that might contain chat data
+            if conn.execute(_CHAT_PROBE_SQL).fetchone() is not None:
+                return True, conn
             
             conn.close()
-            return False
+            return False, None
         except:
-            return False
+            if conn is not None:
+                conn.close()
+            return False, None
     
     def extract_chat_history(self) -> List[ChatSession]:
         """Extract chat history from the database"""
+        return list(self.iter_chat_history())
+    
+    def iter_chat_history(self) -> Iterator[ChatSession]:
+        """Yield chat sessions one at a time as they are extracted"""
         if not self.chat_db_path or not self.chat_db_path.exists():
-            print("Chat database not found. Trying alternative methods...")
-            return self._extract_from_json_files()
+            logger.info("Chat database not found. Trying alternative methods...")
+            yield from self._extract_from_json_files()
+            return
+        
+        # Reuse the connection opened while probing for the database
+        conn, self._chat_conn = self._chat_conn, None
         
         try:
-            conn = sqlite3.connect(str(self.chat_db_path))
+            if conn is None:
+                conn = self._open_database(self.chat_db_path)
             cursor = conn.cursor()
             
             # Get table structure
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
             tables = [row[0] for row in cursor.fetchall()]
-            
-            print(f"Available tables: {tables}")
-            
-            sessions = []
-            
+        except Exception as e:
+            logger.warning("Error reading database: %s", e)
+            if conn is not None:
+                conn.close()
+            yield from self._extract_from_json_files()
+            return
+        
+        logger.debug("Available tables: %s", tables)
+        
+        try:
             # Try to extract data from different table structures
             for table in tables:
                 try:
                     cursor.execute(f"PRAGMA table_info({table})")
-                    columns = [row[1] for row in cursor.fetchall()]
-                    print(f"Table {table} columns: {columns}")
+                    table_info = cursor.fetchall()
+                    columns = [row[1] for row in table_info]
+                    column_types = [row[2] for row in table_info]
+                    logger.debug("Table %s columns: %s", table, columns)
                     
                     # Try to extract messages
-                    cursor.execute(f"SELECT * FROM {table} LIMIT 5")
-                    sample_data = cursor.fetchall()
+                    cursor.execute(f"SELECT * FROM {table} LIMIT 1")
+                    sample_row = cursor.fetchone()
+                    
+                    if sample_row is None:
+                        continue
+                    
+                    logger.debug("Sample data from %s: %s", table, sample_row)
                     
-                    if sample_data:
-                        print(f"Sample data from {table}: {sample_data[0] if sample_data else 'No data'}")
-                        
-                        # Process the data based on structure
-                        sessions.extend(self._process_table_data(cursor, table, columns))
+                    # Process the data based on structure
+                    sessions = self._process_table_data(cursor, table, columns, column_types)
                 
                 except Exception as e:
-                    print(f"Error processing table {table}: {e}")
+                    logger.warning("Error processing table %s: %s", table, e)
                     continue
-            
+                
+                yield from sessions
+        finally:
             conn.close()
-            return sessions
-            
-        except Exception as e:
-            print(f"Error reading database: {e}")
-            return self._extract_from_json_files()
     
-    def _process_table_data(self, cursor, table_name: str, columns: List[str]) -> List[ChatSession]:
+    def _process_table_data(self, cursor, table_name: str, columns: List[str],
+                            column_types: Optional[List[str]] = None) -> List[ChatSession]:
         """Process data from a specific table"""
         sessions = []
         
         try:
+            # Read the whole table inside one explicit transaction and hand
+            # the rows over from SQLite in batches
+            cursor.execute("BEGIN")
+            cursor.arraysize = 1000
             cursor.execute(f"SELECT * FROM {table_name}")
-            rows = cursor.fetchall()
+            batches = iter(cursor.fetchmany, [])
+            
+            # Which columns may hold the content, role and timestamp does not
+            # change from row to row, so decide that once per table. The
+            # candidates are kept last column first: the last matching column
+            # wins, so a row can stop at its first valid value
+            columns_lower = [column.lower() for column in columns]
+            content_indexes = _matching_columns(columns_lower, _CONTENT_COLUMN_KEYWORDS)
+            role_indexes = _matching_columns(columns_lower, _ROLE_COLUMN_KEYWORDS)
+            # Timestamp columns also get a parser picked from their declared type
+            column_types = column_types or [''] * len(columns)
+            timestamp_parsers = tuple(
+                (i, _timestamp_parser(column_types[i]))
+                for i in _matching_columns(columns_lower, _TIMESTAMP_COLUMN_KEYWORDS)
+            )
             
             current_session = ChatSession(
                 session_id=f"session_{datetime.now().isoformat()}",
@@ -282,58 +450,60 @@ class CopilotChatExporter:
                 updated_at=datetime.now()
             )
             
-            for row in rows:
-                row_data = dict(zip(columns, row))
-                
+            for row in chain.from_iterable(batches):
                 # Try to extract message content
                 content = None
+                for i in content_indexes:
+                    value = row[i]
+                    if isinstance(value, str) and value.strip():
+                        content = value
+                        break
+                
+                if content is None:
+                    continue
+                
                 role = "unknown"
-                timestamp = datetime.now()
+                for i in role_indexes:
+                    value = row[i]
+                    if isinstance(value, str):
+                        role = value
+                        break
                 
-                # Look for common field patterns
-                for key, value in row_data.items():
-                    key_lower = key.lower()
-                    
-                    if 'content' in key_lower or 'message' in key_lower or 'text' in key_lower:
-                        if isinstance(value, str) and value.strip():
-                            content = value
-                    
-                    if 'role' in key_lower or 'type' in key_lower or 'sender' in key_lower:
-                        if isinstance(value, str):
-                            role = value
-                    
-                    if 'time' in key_lower or 'date' in key_lower:
-                        try:
-                            if isinstance(value, (int, float)):
-                                timestamp = datetime.fromtimestamp(value / 1000 if value > 1e10 else value)
-                            elif isinstance(value, str):
-                                timestamp = datetime.fromisoformat(value.replace('Z', '+00:00'))
-                        except:
-                            pass
+                timestamp = None
+                for i, parse_timestamp in timestamp_parsers:
+                    value = row[i]
+                    if value is not None:
+                        timestamp = parse_timestamp(value)
+                        if timestamp is not None:
+                            break
+                
+                if timestamp is None:
+                    timestamp = datetime.now()
                 
-                if content:
-                    message = ChatMessage(
-                        id=f"msg_{len(current_session.messages)}",
-                        timestamp=timestamp,
-                        role=role,
-                        content=content,
-                        session_id=current_session.session_id,
-                        metadata=row_data
-                    )
-                    current_session.messages.append(message)
+                # Every field was type-checked above, so skip pydantic validation
+                message = ChatMessage.model_construct(
+                    id=f"msg_{len(current_session.messages)}",
+                    timestamp=timestamp,
+                    role=role,
+                    content=content,
+                    session_id=current_session.session_id,
+                    metadata=dict(zip(columns, row))
+                )
+                current_session.messages.append(message)
             
             if current_session.messages:
                 sessions.append(current_session)
             
         except Exception as e:
-            print(f"Error processing table data: {e}")
+            logger.warning("Error processing table data: %s", e)
+        finally:
+            if cursor.connection.in_transaction:
+                cursor.execute("COMMIT")
         
         return sessions
     
-    def _extract_from_json_files(self) -> List[ChatSession]:
+    def _extract_from_json_files(self) -> Iterator[ChatSession]:
         """Try to extract chat history from JSON files"""
-        sessions = []
-        
         # Look for JSON files in various locations
         search_paths = [
             self.vscode_data_dir / "User",
@@ -342,18 +512,19 @@ class CopilotChatExporter:
         ]
         
         for path in search_paths:
-            if path.exists():
-                for json_file in path.rglob("*.json"):
-                    try:
-                        with open(json_file, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            session = self._parse_json_data(data, json_file.name)
-                            if session and session.messages:
-                                sessions.append(session)
-                    except:
-                        continue
-        
-        return sessions
+            for entry in self._iter_files(path):
+                if not entry.name.lower().endswith('.json'):
+                    continue
+                
+                try:
+                    with open(entry.path, 'rb') as f:
+                        data = _json_loads(f.read())
+                    session = self._parse_json_data(data, entry.name)
+                except:
+                    continue
+                
+                if session and session.messages:
+                    yield session
     
     def _parse_json_data(self, data: Any, filename: str) -> Optional[ChatSession]:
         """Parse JSON data to extract chat messages"""
@@ -374,24 +545,32 @@ class CopilotChatExporter:
             return session if session.messages else None
             
         except Exception as e:
-            print(f"Error parsing JSON data: {e}")
+            logger.warning("Error parsing JSON data: %s", e)
             return None
     
     def _extract_messages_from_dict(self, data: Dict, session: ChatSession):
         """Extract messages from dictionary structure"""
-        for key, value in data.items():
-            if isinstance(value, list):
-                for item in value:
-                    if isinstance(item, dict) and any(k in item for k in ['content', 'message', 'text']):
-                        self._create_message_from_dict(item, session)
-            elif isinstance(value, dict):
-                self._extract_messages_from_dict(value, session)
+        # Walk nested dictionaries depth-first with an explicit stack of
+        # value iterators rather than recursion, so deeply nested state
+        # files neither hit the recursion limit nor pay for a call per level
+        stack = [iter(data.values())]
+        while stack:
+            for value in stack[-1]:
+                if isinstance(value, list):
+                    for item in value:
+                        if isinstance(item, dict) and ('content' in item or 'message' in item or 'text' in item):
+                            self._create_message_from_dict(item, session)
+                elif isinstance(value, dict):
+                    stack.append(iter(value.values()))
+                    break
+            else:
+                stack.pop()
     
     def _extract_messages_from_list(self, data: List, session: ChatSession):
         """Extract messages from list structure"""
         for item in data:
             if isinstance(item, dict):
-                if any(k in item for k in ['content', 'message', 'text']):
+                if 'content' in item or 'message' in item or 'text' in item:
                     self._create_message_from_dict(item, session)
                 else:
                     self._extract_messages_from_dict(item, session)
@@ -402,7 +581,10 @@ class CopilotChatExporter:
         role = item.get('role', item.get('type', item.get('sender', 'unknown')))
         
         if content and isinstance(content, str) and content.strip():
-            message = ChatMessage(
+            # Only the role comes from the JSON data unchecked; validate the
+            # message when it is not a string
+            create = ChatMessage.model_construct if isinstance(role, str) else ChatMessage
+            message = create(
                 id=f"msg_{len(session.messages)}",
                 timestamp=datetime.now(),
                 role=role,
@@ -412,57 +594,29 @@ class CopilotChatExporter:
             )
             session.messages.append(message)
     
-    def export_to_json(self, sessions: List[ChatSession], output_path: str):
+    def export_to_json(self, sessions: Iterable[ChatSession], output_path: Union[str, TextIO]):
         """Export chat history to JSON format"""
-        data = {
-            'exported_at': datetime.now().isoformat(),
-            'total_sessions': len(sessions),
-            'total_messages': sum(len(session.messages) for session in sessions),
-            'sessions': [session.model_dump(mode='json') for session in sessions]
-        }
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False, default=str)
-        
-        print(f"Exported {len(sessions)} sessions to {output_path}")
+        writer = self._export(JsonSessionWriter(output_path), sessions)
+        logger.info("Exported %d sessions to %s", writer.session_count, _output_name(output_path))
+    
+    def export_to_jsonl(self, sessions: Iterable[ChatSession], output_path: Union[str, TextIO]):
+        """Export chat history to JSON Lines format (one session per line)"""
+        writer = self._export(JsonlSessionWriter(output_path), sessions)
+        logger.info("Exported %d sessions to %s", writer.session_count, _output_name(output_path))
     
-    def export_to_csv(self, sessions: List[ChatSession], output_path: str):
+    def export_to_csv(self, sessions: Iterable[ChatSession], output_path: Union[str, TextIO]):
         """Export chat history to CSV format"""
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Session ID', 'Session Title', 'Message ID', 'Timestamp', 'Role', 'Content'])
-            
-            for session in sessions:
-                for message in session.messages:
-                    writer.writerow([
-                        session.session_id,
-                        session.title or '',
-                        message.id,
-                        message.timestamp.isoformat(),
-                        message.role,
-                        message.content.replace('\n', '\\n')
-                    ])
-        
-        print(f"Exported {sum(len(session.messages) for session in sessions)} messages to {output_path}")
+        writer = self._export(CsvSessionWriter(output_path), sessions)
+        logger.info("Exported %d messages to %s", writer.message_count, _output_name(output_path))
     
-    def export_to_markdown(self, sessions: List[ChatSession], output_path: str):
+    def export_to_markdown(self, sessions: Iterable[ChatSession], output_path: Union[str, TextIO]):
         """Export chat history to Markdown format"""
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write("# Copilot Chat History Export\n\n")
-            f.write(f"Exported on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            f.write(f"Total Sessions: {len(sessions)}\n")
-            f.write(f"Total Messages: {sum(len(session.messages) for session in sessions)}\n\n")
-            
-            for i, session in enumerate(sessions, 1):
-                f.write(f"## Session {i}: {session.title or session.session_id}\n\n")
-                f.write(f"**Created:** {session.created_at.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"**Messages:** {len(session.messages)}\n\n")
-                
-                for message in session.messages:
-                    role_emoji = "🧑" if message.role == "user" else "🤖"
-                    f.write(f"### {role_emoji} {message.role.title()}\n")
-                    f.write(f"*{message.timestamp.strftime('%Y-%m-%d %H:%M:%S')}*\n\n")
-                    f.write(f"{message.content}\n\n")
-                    f.write("---\n\n")
-        
-        print(f"Exported {len(sessions)} sessions to {output_path}")
+        writer = self._export(MarkdownSessionWriter(output_path), sessions)
+        logger.info("Exported %d sessions to %s", writer.session_count, _output_name(output_path))
+    
+    def _export(self, writer: SessionWriter, sessions: Iterable[ChatSession]) -> SessionWriter:
+        """Stream sessions through a writer, one at a time"""
+        with writer:
+            for session in sessions:
+                writer.write(session)
+        return writer
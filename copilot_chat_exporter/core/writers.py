@@ -0,0 +1,210 @@
+"""
+Streaming writers for exporting chat sessions.
+
+Each writer receives sessions one at a time, so an export never needs the
+whole chat history in memory.
+"""
+
+import json
+from datetime import datetime
+from typing import Dict, Optional, TextIO, Type, Union
+
+from copilot_chat_exporter.config import format_timestamp
+from copilot_chat_exporter.core.models import ChatSession
+
+try:
+    import orjson
+except ImportError:  # optional speedup, fall back to the standard library
+    orjson = None
+
+
+# Escaping for quoted CSV fields; message content also has its line breaks
+# written as literal \n and \r so every message stays on one line
+_CSV_QUOTE = str.maketrans({'"': '""'})
+_CSV_CONTENT = str.maketrans({'"': '""', '\n': '\\n', '\r': '\\r'})
+
+
+class SessionWriter:
+    """Base class for writers that export chat sessions one at a time"""
+
+    # Passed to open(); newline='' leaves line endings to the writer
+    newline: Optional[str] = None
+    buffering: int = -1
+
+    def __init__(self, output_path: Union[str, TextIO]):
+        # Either a file path or an already open text file, which is left open
+        self.output_path = output_path
+        self.session_count = 0
+        self.message_count = 0
+        self._file: Optional[TextIO] = None
+        self._owns_file = False
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def open(self):
+        """Open the output file and write the header"""
+        if hasattr(self.output_path, 'write'):
+            self._file = self.output_path
+        else:
+            self._file = open(self.output_path, 'w', encoding='utf-8', newline=self.newline,
+                              buffering=self.buffering)
+            self._owns_file = True
+        self._write_header()
+
+    def write(self, session: ChatSession):
+        """Write a single session to the output file"""
+        self._write_session(session)
+        self.session_count += 1
+        self.message_count += len(session.messages)
+
+    def close(self):
+        """Write the footer and close the output file, if the writer opened it"""
+        if self._file is None:
+            return
+        try:
+            self._write_footer()
+        finally:
+            if self._owns_file:
+                self._file.close()
+            self._file = None
+            self._owns_file = False
+
+    def _write_header(self):
+        pass
+
+    def _write_session(self, session: ChatSession):
+        raise NotImplementedError
+
+    def _write_footer(self):
+        pass
+
+
+class JsonSessionWriter(SessionWriter):
+    """Write sessions as a single JSON document, one session at a time"""
+
+    def _write_header(self):
+        self._file.write('{\n')
+        self._file.write(f'  "exported_at": {json.dumps(datetime.now().isoformat())},\n')
+        self._file.write('  "sessions": [')
+
+    def _write_session(self, session: ChatSession):
+        if orjson is not None:
+            data = session.model_dump(mode='json')
+            text = orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str).decode('utf-8')
+        else:
+            # pydantic serializes straight to JSON without an intermediate dict
+            text = session.model_dump_json(indent=2)
+        # Nest the session inside the "sessions" array
+        separator = ',\n    ' if self.session_count else '\n    '
+        self._file.write(separator + text.replace('\n', '\n    '))
+
+    def _write_footer(self):
+        # Totals go last since they are only known once every session is written
+        self._file.write('\n  ],\n' if self.session_count else '],\n')
+        self._file.write(f'  "total_sessions": {self.session_count},\n')
+        self._file.write(f'  "total_messages": {self.message_count}\n')
+        self._file.write('}\n')
+
+
+class JsonlSessionWriter(SessionWriter):
+    """Write sessions as JSON Lines, one session object per line"""
+
+    newline = ''
+
+    def _write_session(self, session: ChatSession):
+        if orjson is not None:
+            data = session.model_dump(mode='json')
+            text = orjson.dumps(data, default=str).decode('utf-8')
+        else:
+            text = session.model_dump_json()
+        self._file.write(text + '\n')
+
+
+class CsvSessionWriter(SessionWriter):
+    """Write sessions as CSV with one row per message"""
+
+    newline = ''
+    buffering = 1 << 20
+
+    def _write_header(self):
+        self._file.write('Session ID,Session Title,Message ID,Timestamp,Role,Content\r\n')
+
+    def _write_session(self, session: ChatSession):
+        # Every field is quoted, so formatting a row only needs quotes doubled
+        # (and line breaks escaped in the content); the session fields are
+        # escaped once and the whole session goes out in a single write
+        session_fields = (
+            f'"{session.session_id.translate(_CSV_QUOTE)}",'
+            f'"{(session.title or "").translate(_CSV_QUOTE)}",'
+        )
+        self._file.write(''.join([
+            f'{session_fields}"{message.id.translate(_CSV_QUOTE)}",'
+            f'"{message.timestamp.isoformat()}",'
+            f'"{message.role.translate(_CSV_QUOTE)}",'
+            f'"{message.content.translate(_CSV_CONTENT)}"\r\n'
+            for message in session.messages
+        ]))
+
+
+class MarkdownSessionWriter(SessionWriter):
+    """Write sessions as a Markdown document"""
+
+    buffering = 1 << 20
+
+    # Number of buffered messages that triggers a write
+    BUFFER_MESSAGES = 1024
+
+    def _write_header(self):
+        self._file.write("# Copilot Chat History Export\n\n")
+        self._file.write(f"Exported on: {format_timestamp(datetime.now())}\n\n")
+
+    def _write_session(self, session: ChatSession):
+        # Format each message in one go and write the messages in large
+        # chunks rather than one write call per line
+        buffer = [
+            f"## Session {self.session_count + 1}: {session.title or session.session_id}\n\n"
+            f"**Created:** {format_timestamp(session.created_at)}\n"
+            f"**Messages:** {len(session.messages)}\n\n"
+        ]
+
+        for message in session.messages:
+            role_emoji = "🧑" if message.role == "user" else "🤖"
+            buffer.append(
+                f"### {role_emoji} {message.role.title()}\n"
+                f"*{format_timestamp(message.timestamp)}*\n\n"
+                f"{message.content}\n\n"
+                "---\n\n"
+            )
+
+            if len(buffer) >= self.BUFFER_MESSAGES:
+                self._file.write(''.join(buffer))
+                buffer.clear()
+
+        self._file.write(''.join(buffer))
+
+    def _write_footer(self):
+        # Totals go last since they are only known once every session is written
+        self._file.write(f"Total Sessions: {self.session_count}\n")
+        self._file.write(f"Total Messages: {self.message_count}\n")
+
+
+WRITERS: Dict[str, Type[SessionWriter]] = {
+    'json': JsonSessionWriter,
+    'jsonl': JsonlSessionWriter,
+    'csv': CsvSessionWriter,
+    'markdown': MarkdownSessionWriter,
+}
+
+
+def get_writer(fmt: str, output_path: Union[str, TextIO]) -> SessionWriter:
+    """Create an (unopened) writer for the given export format"""
+    try:
+        writer_class = WRITERS[fmt]
+    except KeyError:
+        raise ValueError(f"Unsupported export format: {fmt}") from None
+    return writer_class(output_path)
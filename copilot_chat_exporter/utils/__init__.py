@@ -1,5 +1,6 @@
 """Utility functions for Copilot Chat Exporter."""
 
+from copilot_chat_exporter.utils.memory import paused_gc
 from copilot_chat_exporter.utils.workspace_finder import VSCodeWorkspaceFinder
 
-__all__ = ["VSCodeWorkspaceFinder"]
+__all__ = ["VSCodeWorkspaceFinder", "paused_gc"]
@@ -0,0 +1,23 @@
+"""
+Memory management helpers.
+"""
+
+import gc
+from contextlib import contextmanager
+
+
+@contextmanager
+def paused_gc():
+    """Disable cyclic garbage collection for the duration of the block
+
+    Exports allocate many short-lived, non-cyclic objects (messages, rows,
+    output strings) that would otherwise trigger repeated generational
+    collections. Reference counting still frees them as usual.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
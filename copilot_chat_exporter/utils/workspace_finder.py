@@ -5,23 +5,170 @@ This module finds the VS Code workspace ID for a given folder path.
 """
 
 import json
+import logging
+import os
+import re
 import sys
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import chain
+from json.decoder import scanstring
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import BinaryIO, FrozenSet, Iterator, Optional, List, Dict, Tuple, Union
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # optional speedup, fall back to the standard library
+    _json_loads = json.loads
+
+
+# Scheme of local folder URIs in workspace.json
+_FILE_PREFIX = 'file://'
+
+# Folders on other machines, as decoded by _folder_path (which turns Windows
+# backslashes into slashes); they never resolve or exist locally, and
+# touching them can block for a long time
+_REMOTE_PREFIXES = (
+    'vscode-remote://',
+    'docker-desktop://',
+    'wsl.localhost',
+    'wsl$/',
+    '//wsl.localhost/',
+    '//wsl$/',
+)
+
+# Start of a workspace.json whose first key is a string "folder", up to the
+# opening quote of its value
+_FOLDER_FIRST_PATTERN = re.compile(rb'\s*\{\s*"folder"\s*:\s*"')
+
+
+@lru_cache(maxsize=128)
+def _resolve_normalized(folder_path: str) -> str:
+    """Resolve an absolute folder path and normalize it for comparison"""
+    # Convert to forward slashes and lowercase for consistent comparison
+    return Path(folder_path).resolve().as_posix().lower()
+
+
+def _input_variants(folder_path: str, normalized_input_path: str) -> FrozenSet[str]:
+    """Forms of the input path a workspace folder can match without being resolved"""
+    # The folder may have been opened through a symlink, so the unresolved
+    # absolute path is accepted too, with or without a trailing slash
+    variants = {normalized_input_path, Path(os.path.abspath(folder_path)).as_posix().lower()}
+    return frozenset(variants | {variant.rstrip('/') + '/' for variant in variants})
+
+
+def _folder_name(normalized_path: str) -> str:
+    """Last component of a normalized path"""
+    return normalized_path.rstrip('/').rpartition('/')[2]
+
+
+def _read_workspace_folder(f: BinaryIO) -> Optional[str]:
+    """Read the folder a workspace was opened on from its workspace.json"""
+    raw = f.read()
+    
+    # Workspaces opened on a .code-workspace file have no "folder" key; skip
+    # the parse for those. workspace.json files are a line or two long, so
+    # parsing the rest whole is cheaper than streaming the key out of them
+    if b'"folder"' not in raw:
+        return None
+    
+    # VS Code writes "folder" first, so its string value can be decoded on
+    # its own without parsing whatever follows it
+    match = _FOLDER_FIRST_PATTERN.match(raw)
+    if match:
+        return scanstring(raw.decode('utf-8'), match.end())[0]
+    return _json_loads(raw).get('folder')
+
+
+def _maybe_unquote(path: str) -> str:
+    """URL decode a path (handle %3a, %20, etc.), skipping paths with nothing to decode"""
+    return urllib.parse.unquote(path) if '%' in path else path
+
+
+def _folder_path(folder_uri: str) -> str:
+    """Turn the folder URI of a workspace.json into a local path in one pass over the string"""
+    # Remove file:// protocol prefix
+    if folder_uri.startswith(_FILE_PREFIX):
+        folder_uri = folder_uri[len(_FILE_PREFIX):]
+    
+    # URL decode the path
+    folder_uri = _maybe_unquote(folder_uri)
+    
+    if sys.platform == "win32":
+        folder_uri = folder_uri.replace('\\', '/')
+        
+        # Remove leading slash for Windows paths like /c:/path
+        if folder_uri[2:3] == ':' and folder_uri.startswith('/'):
+            folder_uri = folder_uri[1:]
+    
+    return folder_uri
+
+
+def _folder_exists(folder_path: str) -> bool:
+    """Check whether a workspace folder exists, without touching remote locations"""
+    if folder_path.startswith(_REMOTE_PREFIXES):
+        return False
+    return os.path.exists(folder_path)
+
+
+@contextmanager
+def _stdout_logging(logger: logging.Logger):
+    """Print a logger's INFO records to stdout while nothing else handles them"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    previous_level = logger.level
+    
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    try:
+        yield
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(previous_level)
+
+
+# Workspace ID found per (VS Code data directory, accepted forms of the
+# folder path), including folders that have no workspace
+_workspace_id_cache: Dict[tuple, Optional[str]] = {}
+
+# Threads reading workspace.json files (and checking folders) at once
+_MAX_WORKERS = 32
+
+# Cache of the folder in each workspace.json, kept in the cache directory
+# given to the finder
+_FOLDER_CACHE_FILENAME = 'workspace_folders.json'
 
 
 class VSCodeWorkspaceFinder:
     """Find VS Code workspace IDs"""
     
-    def __init__(self):
+    def __init__(self, logger: Optional[logging.Logger] = None, cache_dir: Optional[Union[str, Path]] = None):
+        """Create a finder
+        
+        With cache_dir, the folders read from workspace.json files are saved
+        there and reused by later runs; without it, nothing is written.
+        """
         self.vscode_data_dir = self._find_vscode_data_directory()
+        self.logger = logger or logging.getLogger(__name__)
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        
+        # Folder of each workspace with the workspace.json mtime it was read
+        # at, persisted between runs in the cache file when there is one
+        self._folder_cache: Dict[str, list] = {}
+        self._folder_cache_changed = False
+        
+        # (position, workspace ID, folder path) of every workspace, grouped
+        # by folder name; built by the first lookup and shared by the rest
+        self._index: Optional[Dict[str, List[Tuple[int, str, str]]]] = None
     
-    def _find_vscode_data_directory(self) -> Path:
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _find_vscode_data_directory() -> Path:
         """Find VS Code data directory based on the operating system"""
         if sys.platform == "win32":
             # Windows
-            import os
             base_path = Path(os.environ.get("APPDATA", "")) / "Code"
         elif sys.platform == "darwin":
             # macOS
@@ -32,164 +179,306 @@ class VSCodeWorkspaceFinder:
         
         return base_path
     
+    @staticmethod
+    def default_cache_dir() -> Path:
+        """Per-user cache directory of the exporter, based on the operating system"""
+        if sys.platform == "win32":
+            # Windows
+            base_path = Path(os.environ.get("LOCALAPPDATA", ""))
+        elif sys.platform == "darwin":
+            # macOS
+            base_path = Path.home() / "Library" / "Caches"
+        else:
+            # Linux
+            base_path = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+        
+        return base_path / "copilot-chat-exporter"
+    
+    def refresh(self):
+        """Forget the workspace IDs found so far, e.g. after VS Code opened new folders"""
+        _workspace_id_cache.clear()
+        self._index = None
+    
     def find_workspace_id(self, folder_path: str, verbose: bool = False) -> Optional[str]:
-        """Find VS Code workspace ID for the given folder path"""
+        """Find VS Code workspace ID for the given folder path
+        
+        With verbose, the details of the search are logged at INFO; when
+        logging has not been configured, they are printed to stdout instead.
+        """
+        if verbose and not self.logger.hasHandlers():
+            with _stdout_logging(self.logger):
+                return self._find_workspace_id(folder_path, verbose)
+        return self._find_workspace_id(folder_path, verbose)
+    
+    def _find_workspace_id(self, folder_path: str, verbose: bool = False) -> Optional[str]:
+        # The details are logged at INFO when asked for, DEBUG otherwise
+        level = logging.INFO if verbose else logging.DEBUG
+        log = self.logger.log
+        
         try:
-            # Normalize the input folder path
-            input_path = Path(folder_path).resolve()
-            # Convert to forward slashes and lowercase for consistent comparison
-            normalized_input_path = input_path.as_posix().lower()
-            
-            if verbose:
-                print(f"🔍 Looking for workspace ID for: {folder_path}")
-                print(f"📁 Normalized path: {normalized_input_path}")
-            
-            # Get workspace storage path
-            workspace_storage_path = self.vscode_data_dir / "User" / "workspaceStorage"
-            
-            if not workspace_storage_path.exists():
-                if verbose:
-                    print(f"❌ Workspace storage path does not exist: {workspace_storage_path}")
-                    print("   Make sure VS Code has been run at least once on this system.")
-                return None
+            # Normalize the input folder path. The resolution is cached, so
+            # a relative path is made absolute first to tie it to the current
+            # directory
+            normalized_input_path = _resolve_normalized(os.path.abspath(folder_path))
             
-            if verbose:
-                print(f"🗂️  Searching in workspace storage: {workspace_storage_path}")
+            log(level, "🔍 Looking for workspace ID for: %s", folder_path)
+            log(level, "📁 Normalized path: %s", normalized_input_path)
             
-            # Iterate through each workspace ID directory
-            workspace_directories = list(workspace_storage_path.iterdir())
+            # Compute the accepted forms of the input and their folder names
+            # once for all candidates
+            input_variants = _input_variants(folder_path, normalized_input_path)
+            input_names = frozenset(_folder_name(variant) for variant in input_variants)
             
-            if verbose:
-                print(f"📊 Found {len(workspace_directories)} workspace directories to check")
+            # Reuse an earlier lookup, unless the details were asked for. The
+            # unresolved forms take part in matching, so they are part of the key
+            cache_key = (str(self.vscode_data_dir), input_variants)
+            if not verbose and cache_key in _workspace_id_cache:
+                return _workspace_id_cache[cache_key]
             
-            for directory in workspace_directories:
-                if not directory.is_dir():
-                    continue
-                    
-                workspace_id = directory.name
-                workspace_json_path = directory / 'workspace.json'
-                
-                if verbose:
-                    print(f"🔎 Checking workspace ID: {workspace_id}")
-                
-                if workspace_json_path.exists():
-                    if verbose:
-                        print(f"📄 Found workspace.json for ID: {workspace_id}")
-                    
-                    try:
-                        with open(workspace_json_path, 'r', encoding='utf-8') as f:
-                            json_content = json.load(f)
-                        
-                        if json_content.get('folder'):
-                            # Handle URL format workspace paths properly
-                            workspace_folder_path = json_content['folder']
-                            
-                            if verbose:
-                                print(f"   Raw workspace path from JSON: {workspace_folder_path}")
-                            
-                            # Remove file:// protocol prefix
-                            if workspace_folder_path.startswith('file://'):
-                                workspace_folder_path = workspace_folder_path[7:]  # Remove 'file://'
-                            
-                            # URL decode the path (handle %3a, %20, etc.)
-                            workspace_folder_path = urllib.parse.unquote(workspace_folder_path)
-                            
-                            # Handle Windows paths that start with /c:/ pattern
-                            if sys.platform == "win32" and workspace_folder_path.startswith('/') and ':' in workspace_folder_path:
-                                # Remove leading slash for Windows paths like /c:/path
-                                workspace_folder_path = workspace_folder_path[1:]
-                            
-                            if verbose:
-                                print(f"   Processed workspace path: {workspace_folder_path}")
-                            
-                            # Normalize the workspace path for comparison
-                            try:
-                                workspace_path = Path(workspace_folder_path)
-                                
-                                # Skip remote paths (they won't resolve properly)
-                                if workspace_folder_path.startswith(('vscode-remote://', 'wsl.localhost')):
-                                    if verbose:
-                                        print(f"   Skipping remote path: {workspace_folder_path}")
-                                    continue
-                                
-                                # Try to resolve the path, if it fails, use as-is
-                                try:
-                                    normalized_workspace_path = workspace_path.resolve().as_posix().lower()
-                                except (OSError, ValueError):
-                                    # If resolve fails, just normalize the string representation
-                                    normalized_workspace_path = workspace_path.as_posix().lower()
-                                
-                                if verbose:
-                                    print(f"   Normalized workspace path: {normalized_workspace_path}")
-                                
-                                if normalized_workspace_path == normalized_input_path:
-                                    if verbose:
-                                        print(f"✅ Match found!")
-                                    return workspace_id
-                                    
-                            except Exception as e:
-                                if verbose:
-                                    print(f"⚠️  Error normalizing workspace path '{workspace_folder_path}': {e}")
-                                continue
-                        else:
-                            if verbose:
-                                print(f"   No folder property found in workspace.json")
-                                
-                    except Exception as e:
-                        if verbose:
-                            print(f"⚠️  Error parsing workspace.json for ID {workspace_id}: {e}")
-                        continue
-                else:
-                    if verbose:
-                        print(f"   No workspace.json found for ID: {workspace_id}")
-            
-            if verbose:
-                print("❌ Workspace ID not found for the specified folder path")
+            if self._index is None:
+                self._index = self._build_index(level)
+            
+            # Folders with the same name as the input are compared first, in
+            # directory order. Only a folder recorded through a symlink with
+            # another name can match otherwise, so the remaining folders are
+            # resolved only when none of those match
+            candidates = sorted(chain.from_iterable(self._index.get(name, ()) for name in input_names))
+            other_candidates = sorted(
+                candidate
+                for name, workspaces in self._index.items() if name not in input_names
+                for candidate in workspaces
+            )
+            
+            workspace_id = None
+            for _, candidate_id, workspace_folder_path in chain(candidates, other_candidates):
+                log(level, "🔎 Comparing workspace ID: %s", candidate_id)
+                if self._matches(workspace_folder_path, input_variants, level):
+                    workspace_id = candidate_id
+                    break
+            
+            _workspace_id_cache[cache_key] = workspace_id
+            
+            if workspace_id:
+                return workspace_id
+            
+            log(level, "❌ Workspace ID not found for the specified folder path")
             return None
             
         except Exception as e:
-            if verbose:
-                print(f"❌ Error finding workspace ID: {e}")
+            log(level, "❌ Error finding workspace ID: %s", e)
             return None
     
-    def list_all_workspaces(self) -> List[Dict[str, str]]:
-        """List all VS Code workspaces"""
-        workspaces = []
+    def _build_index(self, level: int = logging.DEBUG) -> Dict[str, List[Tuple[int, str, str]]]:
+        """Group all workspaces by the name of their folder"""
+        index: Dict[str, List[Tuple[int, str, str]]] = {}
+        for position, (workspace_id, workspace_folder_path, _) in enumerate(self._iter_workspaces(level)):
+            name = _folder_name(workspace_folder_path.lower())
+            index.setdefault(name, []).append((position, workspace_id, workspace_folder_path))
+        return index
+    
+    def _matches(self, workspace_folder_path: str, input_variants: FrozenSet[str],
+                 level: int = logging.DEBUG) -> bool:
+        """Check whether a workspace folder is the input path"""
+        log = self.logger.log
+        
+        # Normalize the workspace path for comparison
+        try:
+            # Skip remote paths (they won't resolve properly)
+            if workspace_folder_path.startswith(_REMOTE_PREFIXES):
+                log(level, "   Skipping remote path: %s", workspace_folder_path)
+                return False
+            
+            # A folder that is one of the input forms as a string matches
+            # without touching the filesystem
+            normalized_workspace_path = workspace_folder_path.lower()
+            
+            if normalized_workspace_path not in input_variants:
+                # Try to resolve the path, if it fails, use as-is
+                workspace_path = Path(workspace_folder_path)
+                try:
+                    normalized_workspace_path = workspace_path.resolve().as_posix().lower()
+                except (OSError, ValueError):
+                    # If resolve fails, just normalize the string representation
+                    normalized_workspace_path = workspace_path.as_posix().lower()
+            
+            log(level, "   Normalized workspace path: %s", normalized_workspace_path)
+            
+            if normalized_workspace_path in input_variants:
+                log(level, "✅ Match found!")
+                return True
+                
+        except Exception as e:
+            log(level, "⚠️  Error normalizing workspace path '%s': %s", workspace_folder_path, e)
+        
+        return False
+    
+    def list_all_workspaces(self, check_existence: bool = False) -> List[Dict[str, str]]:
+        """List all VS Code workspaces, with whether each folder exists if check_existence is set"""
+        workspaces = [
+            {'id': workspace_id, 'path': workspace_folder_path}
+            for workspace_id, workspace_folder_path, _ in self._iter_workspaces()
+        ]
+        
+        if check_existence:
+            # Check the folders concurrently so slow (e.g. network) paths
+            # don't add up one after another
+            with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+                results = executor.map(_folder_exists, [workspace['path'] for workspace in workspaces])
+                for workspace, exists in zip(workspaces, results):
+                    workspace['exists'] = exists
         
+        return workspaces
+    
+    def _iter_workspaces(self, level: int = logging.DEBUG) -> Iterator[Tuple[str, str, str]]:
+        """Yield the ID, folder path and workspace.json path of every workspace, in directory order"""
+        log = self.logger.log
+        
+        # Get workspace storage path
         workspace_storage_path = self.vscode_data_dir / "User" / "workspaceStorage"
         
-        if not workspace_storage_path.exists():
-            return workspaces
+        # Iterate through each workspace ID directory; scandir reports the
+        # entry types without a stat() per entry, and a missing directory
+        # without a separate exists() check
+        try:
+            with os.scandir(workspace_storage_path) as entries:
+                workspace_directories = list(entries)
+        except (FileNotFoundError, NotADirectoryError):
+            log(level, "❌ Workspace storage path does not exist: %s", workspace_storage_path)
+            log(level, "   Make sure VS Code has been run at least once on this system.")
+            return
         
-        for directory in workspace_storage_path.iterdir():
-            if not directory.is_dir():
-                continue
-                
-            workspace_id = directory.name
-            workspace_json_path = directory / 'workspace.json'
+        log(level, "🗂️  Searching in workspace storage: %s", workspace_storage_path)
+        log(level, "📊 Found %d workspace directories to check", len(workspace_directories))
+        
+        self._load_folder_cache()
+        try:
+            if self.logger.isEnabledFor(level):
+                # Read one directory at a time so the details are logged in order
+                for directory in workspace_directories:
+                    workspace = self._read_workspace(directory, level)
+                    if workspace:
+                        yield workspace
+                return
             
-            if workspace_json_path.exists():
+            # Read the workspace.json files concurrently, but yield them in
+            # directory order; whatever is left is cancelled once the caller
+            # stops early
+            with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+                futures = [executor.submit(self._read_workspace, directory) for directory in workspace_directories]
                 try:
-                    with open(workspace_json_path, 'r', encoding='utf-8') as f:
-                        json_content = json.load(f)
-                    
-                    if json_content.get('folder'):
-                        workspace_folder_path = json_content['folder']
-                        
-                        # Remove file:// protocol prefix
-                        if workspace_folder_path.startswith('file://'):
-                            workspace_folder_path = workspace_folder_path[7:]
-                        
-                        # URL decode the path
-                        workspace_folder_path = urllib.parse.unquote(workspace_folder_path)
-                        
-                        workspaces.append({
-                            'id': workspace_id,
-                            'path': workspace_folder_path,
-                            'exists': Path(workspace_folder_path).exists()
-                        })
-                        
-                except Exception:
-                    continue
+                    for future in futures:
+                        workspace = future.result()
+                        if workspace:
+                            yield workspace
+                finally:
+                    for future in futures:
+                        future.cancel()
+        finally:
+            self._save_folder_cache(workspace_directories)
+    
+    def _read_workspace(self, directory: os.DirEntry,
+                        level: int = logging.DEBUG) -> Optional[Tuple[str, str, str]]:
+        """Read the ID, folder path and workspace.json path of a workspace storage directory"""
+        if not directory.is_dir():
+            return None
         
-        return workspaces
+        log = self.logger.log
+        workspace_id = directory.name
+        workspace_json_path = os.path.join(directory.path, 'workspace.json')
+        
+        log(level, "🔎 Checking workspace ID: %s", workspace_id)
+        
+        # Open workspace.json directly instead of checking that it exists first
+        try:
+            workspace_folder_path = self._cached_workspace_folder(workspace_id, workspace_json_path)
+            
+            log(level, "📄 Found workspace.json for ID: %s", workspace_id)
+            
+            if not workspace_folder_path:
+                log(level, "   No folder property found in workspace.json")
+                return None
+            
+            # Handle URL format workspace paths properly
+            log(level, "   Raw workspace path from JSON: %s", workspace_folder_path)
+            
+            workspace_folder_path = _folder_path(workspace_folder_path)
+            
+            log(level, "   Processed workspace path: %s", workspace_folder_path)
+            
+        except FileNotFoundError:
+            log(level, "   No workspace.json found for ID: %s", workspace_id)
+            return None
+        except Exception as e:
+            log(level, "⚠️  Error parsing workspace.json for ID %s: %s", workspace_id, e)
+            return None
+        
+        return workspace_id, workspace_folder_path, workspace_json_path
+    
+    @property
+    def _folder_cache_path(self) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / _FOLDER_CACHE_FILENAME
+    
+    def _load_folder_cache(self):
+        """Load the cached workspace folders saved by a previous run"""
+        if self._folder_cache_path is None:
+            return
+        
+        try:
+            with open(self._folder_cache_path, 'rb') as f:
+                data = _json_loads(f.read())
+        except (OSError, ValueError):
+            return
+        
+        # A cache saved for another VS Code data directory is replaced on save
+        if not isinstance(data, dict) or data.get('vscode_data_dir') != str(self.vscode_data_dir):
+            return
+        
+        workspaces = data.get('workspaces')
+        if isinstance(workspaces, dict):
+            self._folder_cache = {
+                workspace_id: entry for workspace_id, entry in workspaces.items()
+                if isinstance(entry, list) and len(entry) == 2
+            }
+            self._folder_cache_changed = False
+    
+    def _save_folder_cache(self, workspace_directories: List[os.DirEntry]):
+        """Save the workspace folders, dropping workspaces that no longer exist"""
+        workspace_ids = {directory.name for directory in workspace_directories}
+        stale_ids = self._folder_cache.keys() - workspace_ids
+        
+        for workspace_id in stale_ids:
+            del self._folder_cache[workspace_id]
+        
+        if self._folder_cache_path is None or not (self._folder_cache_changed or stale_ids):
+            return
+        
+        # Write to a temporary file first so a concurrent run never reads a
+        # partially written cache
+        temporary_path = self._folder_cache_path.with_name(_FOLDER_CACHE_FILENAME + '.tmp')
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(temporary_path, 'w', encoding='utf-8') as f:
+                json.dump({'vscode_data_dir': str(self.vscode_data_dir), 'workspaces': self._folder_cache}, f)
+            os.replace(temporary_path, self._folder_cache_path)
+            self._folder_cache_changed = False
+        except OSError:
+            pass
+    
+    def _cached_workspace_folder(self, workspace_id: str, workspace_json_path: str) -> Optional[str]:
+        """Read the folder of a workspace.json, reusing the cached value while the file is unchanged"""
+        # Take the modification time from the open file, so a cache hit costs
+        # one open and fstat rather than a separate stat of the path
+        with open(workspace_json_path, 'rb') as f:
+            mtime = os.fstat(f.fileno()).st_mtime_ns
+            
+            cached = self._folder_cache.get(workspace_id)
+            if cached is not None and cached[1] == mtime:
+                return cached[0]
+            
+            workspace_folder_path = _read_workspace_folder(f)
+        
+        self._folder_cache[workspace_id] = [workspace_folder_path, mtime]
+        self._folder_cache_changed = True
+        return workspace_folder_path
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Tests for finding and reading the chat database
+
+Databases are built with sqlite3 under a temporary VS Code data directory,
+so nothing outside tmp_path is read.
+"""
+
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+
+from copilot_chat_exporter.core.exporter import (
+    _CONTENT_COLUMN_KEYWORDS,
+    _PROBE_WORKERS,
+    _TIMESTAMP_COLUMN_KEYWORDS,
+    CopilotChatExporter,
+    _matching_columns,
+    _timestamp_parser,
+)
+
+
+def make_database(path, table):
+    """Create a SQLite database with one empty table"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path))
+    conn.execute(f"CREATE TABLE {table} (id INTEGER, content TEXT)")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def make_candidates(tmp_path, tables):
+    """One database per table name, in the given order"""
+    return [make_database(tmp_path / "dbs" / f"{i:02d}.vscdb", table) for i, table in enumerate(tables)]
+
+
+@pytest.fixture
+def exporter(tmp_path, monkeypatch):
+    """An exporter whose VS Code data directory and working directory are empty"""
+    monkeypatch.setattr(
+        CopilotChatExporter, "_find_vscode_data_directory", staticmethod(lambda: tmp_path / "Code")
+    )
+    monkeypatch.chdir(tmp_path)
+    exporter = CopilotChatExporter(str(tmp_path))
+    yield exporter
+    exporter.close()
+
+
+def record_probes(exporter):
+    """Record the connection every probe returns"""
+    connections = []
+    probe = exporter._is_chat_database
+
+    def recording_probe(db_path):
+        is_chat, conn = probe(db_path)
+        if conn is not None:
+            connections.append((db_path, conn))
+        return is_chat, conn
+
+    exporter._is_chat_database = recording_probe
+    return connections
+
+
+def test_first_chat_database_in_walk_order_wins(exporter, tmp_path):
+    """The earliest match is returned however the concurrent probes finish"""
+    tables = ["settings"] * 20
+    for i in (5, 12, 18):
+        tables[i] = "chat_messages"
+    candidates = make_candidates(tmp_path, tables)
+
+    for _ in range(10):
+        assert exporter._find_first_chat_database(candidates) == candidates[5]
+
+        # The connection of the match is kept for the extraction
+        conn = exporter._chat_conn
+        assert conn.execute("SELECT name FROM sqlite_master").fetchone() == ("chat_messages",)
+        exporter.close()
+
+
+def test_later_matching_connections_are_closed(exporter, tmp_path):
+    """Only the connection of the returned database stays open"""
+    candidates = make_candidates(tmp_path, ["chat_messages"] * 20)
+    connections = record_probes(exporter)
+
+    assert exporter._find_first_chat_database(candidates) == candidates[0]
+    assert connections
+
+    for db_path, conn in connections:
+        if db_path == candidates[0]:
+            assert conn is exporter._chat_conn
+            conn.execute("SELECT 1")
+        else:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+
+
+def test_walk_stops_at_first_match(exporter, tmp_path):
+    """Candidates after the probe window of the first match are never produced"""
+    candidates = make_candidates(tmp_path, ["chat_messages"] * 20)
+    produced = []
+
+    def walk():
+        for db_file in candidates:
+            produced.append(db_file)
+            yield db_file
+
+    assert exporter._find_first_chat_database(walk()) == candidates[0]
+    assert len(produced) == _PROBE_WORKERS
+
+
+def test_no_chat_database(exporter, tmp_path):
+    """Non-SQLite files and databases without chat tables are rejected"""
+    candidates = make_candidates(tmp_path, ["settings", "items"])
+    not_sqlite = tmp_path / "dbs" / "chat.json"
+    not_sqlite.write_text('{"chat": []}')
+    empty = tmp_path / "dbs" / "empty.vscdb"
+    empty.touch()
+
+    assert exporter._find_first_chat_database(candidates + [not_sqlite, empty]) is None
+    assert exporter._chat_conn is None
+
+
+def test_matching_columns_last_column_first():
+    """Matching column indexes come back in reverse column order"""
+    columns = ["id", "content", "role", "message_text", "created_time"]
+
+    assert _matching_columns(columns, _CONTENT_COLUMN_KEYWORDS) == (3, 1)
+    assert _matching_columns(columns, _TIMESTAMP_COLUMN_KEYWORDS) == (4,)
+    assert _matching_columns(columns, ("missing",)) == ()
+
+
+def test_timestamp_parser_by_declared_type():
+    """The parser follows the declared type and falls back for other values"""
+    seconds = datetime.fromtimestamp(1700000000)
+
+    assert _timestamp_parser("INTEGER")(1700000000) == seconds
+    assert _timestamp_parser("BIGINT")(1700000000000) == seconds
+    assert _timestamp_parser("REAL")(1700000000.0) == seconds
+    assert _timestamp_parser("TEXT")("2024-01-15T09:00:00Z") == datetime(2024, 1, 15, 9, tzinfo=timezone.utc)
+    assert _timestamp_parser("VARCHAR(32)")("not a date") is None
+
+    # SQLite does not enforce declared types
+    assert _timestamp_parser("TEXT")(1700000000) == seconds
+    assert _timestamp_parser("INTEGER")("2024-01-15T09:00:00") == datetime(2024, 1, 15, 9)
+    assert _timestamp_parser("")(b"1700000000") is None
+
+
+def test_last_valid_column_wins(exporter, tmp_path):
+    """Each field comes from the last matching column holding a usable value"""
+    db_path = tmp_path / "Code" / "User" / "globalStorage" / "chat.vscdb"
+    db_path.parent.mkdir(parents=True)
+    conn = sqlite3.connect(str(db_path))
+    conn.execute(
+        "CREATE TABLE chat_messages (id INTEGER, content TEXT, message TEXT, role TEXT, "
+        "sender, created_time INTEGER, edited_date TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO chat_messages VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (1, "from content", "from message", "user", "assistant", 1700000000000, "2024-01-15T09:00:00Z"),
+            (2, "from content", "   ", "user", None, 1700000000, "not a date"),
+            (3, None, None, "user", None, None, None),
+            (4, "only content", None, None, 7, None, None),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    exporter._find_chat_database()
+    assert exporter.chat_db_path == db_path
+
+    sessions = exporter.extract_chat_history()
+    assert len(sessions) == 1
+    messages = sessions[0].messages
+
+    assert [(m.content, m.role) for m in messages] == [
+        ("from message", "assistant"),
+        ("from content", "user"),
+        ("only content", "unknown"),
+    ]
+    assert messages[0].timestamp == datetime(2024, 1, 15, 9, tzinfo=timezone.utc)
+    assert messages[1].timestamp == datetime.fromtimestamp(1700000000)
@@ -5,6 +5,8 @@ Test script for Copilot Chat Exporter
 This script tests the basic functionality of the chat exporter.
 """
 
+import io
+import json
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -41,34 +43,6 @@ def test_basic_functionality():
         )
         print("✅ ChatSession created successfully")
         
-        # Test export functions (with dummy data)
-        test_export_dir = Path("test_exports")
-        test_export_dir.mkdir(exist_ok=True)
-        
-        # Test JSON export
-        json_file = test_export_dir / "test_export.json"
-        exporter.export_to_json([test_session], str(json_file))
-        if json_file.exists():
-            print("✅ JSON export test successful")
-            json_file.unlink()  # Clean up
-        
-        # Test CSV export
-        csv_file = test_export_dir / "test_export.csv"
-        exporter.export_to_csv([test_session], str(csv_file))
-        if csv_file.exists():
-            print("✅ CSV export test successful")
-            csv_file.unlink()  # Clean up
-        
-        # Test Markdown export
-        md_file = test_export_dir / "test_export.md"
-        exporter.export_to_markdown([test_session], str(md_file))
-        if md_file.exists():
-            print("✅ Markdown export test successful")
-            md_file.unlink()  # Clean up
-        
-        # Clean up test directory
-        test_export_dir.rmdir()
-        
         print("\n🎉 All tests passed!")
         
     except Exception as e:
@@ -78,6 +52,53 @@ def test_basic_functionality():
     return True
 
 
+def test_export_functionality():
+    """Test every export format, writing to memory"""
+    print("\n📤 Testing export functionality...")
+    
+    exporter = CopilotChatExporter()
+    test_session = ChatSession(
+        session_id="test_session_1",
+        title="Test Session",
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+        messages=[
+            ChatMessage(
+                id="test_msg_1",
+                timestamp=datetime.now(),
+                role="user",
+                content="This is a test message"
+            )
+        ]
+    )
+    
+    # Test JSON export
+    json_buffer = io.StringIO()
+    exporter.export_to_json([test_session], json_buffer)
+    json_data = json.loads(json_buffer.getvalue())
+    assert json_data["total_sessions"] == 1
+    assert json_data["sessions"][0]["messages"][0]["content"] == "This is a test message"
+    print("✅ JSON export test successful")
+    
+    # Test JSON Lines export
+    jsonl_buffer = io.StringIO()
+    exporter.export_to_jsonl([test_session], jsonl_buffer)
+    assert json.loads(jsonl_buffer.getvalue())["session_id"] == "test_session_1"
+    print("✅ JSON Lines export test successful")
+    
+    # Test CSV export
+    csv_buffer = io.StringIO()
+    exporter.export_to_csv([test_session], csv_buffer)
+    assert "This is a test message" in csv_buffer.getvalue()
+    print("✅ CSV export test successful")
+    
+    # Test Markdown export
+    md_buffer = io.StringIO()
+    exporter.export_to_markdown([test_session], md_buffer)
+    assert "This is a test message" in md_buffer.getvalue()
+    print("✅ Markdown export test successful")
+
+
 def test_workspace_functionality():
     """Test workspace ID detection functionality"""
     print("\n🔍 Testing workspace functionality...")
@@ -139,11 +160,17 @@ def main():
     
     # Run tests
     tests_passed = 0
-    total_tests = 2
+    total_tests = 3
     
     if test_basic_functionality():
         tests_passed += 1
     
+    try:
+        test_export_functionality()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ Export test failed: {e!r}")
+    
     if test_workspace_functionality():
         tests_passed += 1
     
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Tests for the workspace ID lookup
+
+Each test builds a fake VS Code workspaceStorage under tmp_path, with
+workspace.json files pointing at real folders, symlinks to them and folders
+with other names.
+"""
+
+import io
+import json
+import os
+
+import pytest
+
+from copilot_chat_exporter.utils import workspace_finder
+from copilot_chat_exporter.utils.workspace_finder import VSCodeWorkspaceFinder, _read_workspace_folder
+
+
+def workspace_ids(count):
+    """Distinct 32 character workspace IDs"""
+    return [f"{i:032x}" for i in range(1, count + 1)]
+
+
+def make_folder(path):
+    path.mkdir(parents=True)
+    return path
+
+
+def make_link(path, target):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.symlink_to(target, target_is_directory=True)
+    return path
+
+
+def write_workspace(storage, workspace_id, folder):
+    """Record a workspace opened on folder, the way VS Code writes workspace.json"""
+    directory = storage / workspace_id
+    directory.mkdir(exist_ok=True)
+    (directory / "workspace.json").write_text(json.dumps({"folder": folder.as_uri()}))
+
+
+def storage_order(storage):
+    """Workspace IDs in the order the finder lists them"""
+    return [entry.name for entry in os.scandir(storage)]
+
+
+def make_storage(tmp_path, count):
+    """Create workspace directories and return them in listing order"""
+    storage = tmp_path / "Code" / "User" / "workspaceStorage"
+    storage.mkdir(parents=True)
+    for workspace_id in workspace_ids(count):
+        (storage / workspace_id).mkdir()
+    return storage, storage_order(storage)
+
+
+def make_finder(tmp_path, **kwargs):
+    """A finder reading the fake VS Code data directory, with no earlier lookups"""
+    finder = VSCodeWorkspaceFinder(**kwargs)
+    finder.vscode_data_dir = tmp_path / "Code"
+    finder.refresh()
+    return finder
+
+
+@pytest.fixture
+def symlinked_project(tmp_path):
+    """A project folder and a symlink to it under another name"""
+    project = make_folder(tmp_path / "work" / "proj")
+    alias = make_link(tmp_path / "links" / "alias", project)
+    return project, alias
+
+
+def test_index_groups_by_folder_name_in_listing_order(tmp_path):
+    """Workspaces are grouped by folder name, each group in listing order"""
+    storage, order = make_storage(tmp_path, 5)
+    folders = {
+        order[0]: make_folder(tmp_path / "a" / "proj"),
+        order[1]: make_folder(tmp_path / "other"),
+        order[2]: make_folder(tmp_path / "b" / "Proj"),
+        order[3]: make_folder(tmp_path / "c" / "proj"),
+    }
+    for workspace_id, folder in folders.items():
+        write_workspace(storage, workspace_id, folder)
+    # The last directory has no workspace.json and is left out
+
+    index = make_finder(tmp_path)._build_index()
+
+    assert set(index) == {"proj", "other"}
+    assert [(position, workspace_id) for position, workspace_id, _ in index["proj"]] == [
+        (0, order[0]), (2, order[2]), (3, order[3]),
+    ]
+    assert [workspace_id for _, workspace_id, _ in index["other"]] == [order[1]]
+
+
+def test_same_named_folder_is_compared_first(tmp_path, symlinked_project):
+    """A folder recorded under the input's own name is found without resolving the others"""
+    project, alias = symlinked_project
+    storage, order = make_storage(tmp_path, 2)
+    # The symlink comes first in the listing, and it matches as well
+    write_workspace(storage, order[0], alias)
+    write_workspace(storage, order[1], project)
+
+    finder = make_finder(tmp_path)
+    compared = []
+    matches = finder._matches
+
+    def recording_matches(workspace_folder_path, *args):
+        compared.append(workspace_folder_path)
+        return matches(workspace_folder_path, *args)
+
+    finder._matches = recording_matches
+
+    assert finder.find_workspace_id(str(project)) == order[1]
+    assert compared == [str(project)]
+
+
+def test_symlinked_folder_matches_through_resolution(tmp_path, symlinked_project):
+    """A folder recorded through a symlink with another name still matches"""
+    project, alias = symlinked_project
+    storage, order = make_storage(tmp_path, 3)
+    write_workspace(storage, order[0], make_folder(tmp_path / "unrelated"))
+    write_workspace(storage, order[1], alias)
+
+    assert make_finder(tmp_path).find_workspace_id(str(project)) == order[1]
+
+
+def test_symlinked_input_matches_resolved_folder(tmp_path, symlinked_project):
+    """Looking up a symlink finds the workspace of the folder it points at"""
+    project, alias = symlinked_project
+    storage, order = make_storage(tmp_path, 1)
+    write_workspace(storage, order[0], project)
+
+    assert make_finder(tmp_path).find_workspace_id(str(alias)) == order[0]
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_cached_lookups_keep_unresolved_forms_apart(tmp_path, symlinked_project, reverse):
+    """A symlink and its target share a resolved path, but not a cached result"""
+    project, alias = symlinked_project
+    storage, order = make_storage(tmp_path, 2)
+    # Both workspaces match the symlink; the first listed one wins for it,
+    # while the project itself is found by name
+    write_workspace(storage, order[0], alias)
+    write_workspace(storage, order[1], project)
+    expected = {str(alias): order[0], str(project): order[1]}
+
+    finder = make_finder(tmp_path)
+    lookups = sorted(expected, reverse=reverse)
+    for folder_path in lookups + lookups:
+        assert finder.find_workspace_id(folder_path) == expected[folder_path]
+
+
+def test_relative_path_follows_current_directory(tmp_path, monkeypatch):
+    """'.' is looked up again after changing directory"""
+    first = make_folder(tmp_path / "first project")
+    second = make_folder(tmp_path / "second")
+    storage, order = make_storage(tmp_path, 2)
+    write_workspace(storage, order[0], first)
+    write_workspace(storage, order[1], second)
+
+    finder = make_finder(tmp_path)
+
+    monkeypatch.chdir(first)
+    assert finder.find_workspace_id(".") == order[0]
+    monkeypatch.chdir(second)
+    assert finder.find_workspace_id(".") == order[1]
+    monkeypatch.chdir(tmp_path)
+    assert finder.find_workspace_id(".") is None
+
+
+@pytest.mark.parametrize("raw", [
+    b'{"folder":"file:///home/me/a%20b"}',
+    b'{\n\t"folder": "file:///home/me/quote\\"d\\\\back"\n}',
+    b'{"folder": "file:///home/me/caf\\u00e9"}',
+    '{"folder": "file:///home/me/café", "id": 1}'.encode('utf-8'),
+    b'{"configuration": {"$mid": 1}, "folder": "file:///home/me/later"}',
+    b'{"workspace": "file:///home/me/my.code-workspace"}',
+    b'{"configuration": {"folder": "nested"}}',
+])
+def test_read_workspace_folder_matches_json(raw):
+    """The fast path for a leading "folder" key agrees with a full parse"""
+    assert _read_workspace_folder(io.BytesIO(raw)) == json.loads(raw).get("folder")
+
+
+def test_folder_cache_reuses_unchanged_workspace_json(tmp_path, monkeypatch):
+    """Cached folders are reused until their workspace.json changes"""
+    storage, order = make_storage(tmp_path, 3)
+    for i, workspace_id in enumerate(order):
+        write_workspace(storage, workspace_id, make_folder(tmp_path / f"folder{i}"))
+    cache_dir = tmp_path / "cache"
+
+    reads = []
+
+    def counting_read(f):
+        reads.append(f.name)
+        return _read_workspace_folder(f)
+
+    monkeypatch.setattr(workspace_finder, "_read_workspace_folder", counting_read)
+
+    # The first run reads everything and saves it
+    assert len(make_finder(tmp_path, cache_dir=cache_dir).list_all_workspaces()) == 3
+    assert len(reads) == 3
+    saved = json.loads((cache_dir / "workspace_folders.json").read_text())
+    assert saved["vscode_data_dir"] == str(tmp_path / "Code")
+    assert set(saved["workspaces"]) == set(order)
+
+    # A later run reads nothing
+    reads.clear()
+    assert len(make_finder(tmp_path, cache_dir=cache_dir).list_all_workspaces()) == 3
+    assert reads == []
+
+    # A changed workspace.json is read again; a removed workspace is dropped
+    workspace_json = storage / order[0] / "workspace.json"
+    write_workspace(storage, order[0], make_folder(tmp_path / "moved"))
+    mtime = os.stat(workspace_json).st_mtime_ns + 1_000_000_000
+    os.utime(workspace_json, ns=(mtime, mtime))
+    (storage / order[2] / "workspace.json").unlink()
+    (storage / order[2]).rmdir()
+
+    reads.clear()
+    workspaces = make_finder(tmp_path, cache_dir=cache_dir).list_all_workspaces()
+    assert reads == [str(workspace_json)]
+    assert {workspace["id"]: workspace["path"] for workspace in workspaces} == {
+        order[0]: str(tmp_path / "moved"),
+        order[1]: str(tmp_path / "folder1"),
+    }
+    saved = json.loads((cache_dir / "workspace_folders.json").read_text())
+    assert set(saved["workspaces"]) == {order[0], order[1]}
+
+
+def test_folder_cache_is_not_written_without_cache_dir(tmp_path):
+    """A finder without a cache directory leaves the filesystem alone"""
+    storage, order = make_storage(tmp_path, 1)
+    write_workspace(storage, order[0], make_folder(tmp_path / "proj"))
+    before = sorted(path for path in tmp_path.rglob("*"))
+
+    assert make_finder(tmp_path).find_workspace_id(str(tmp_path / "proj")) == order[0]
+    assert sorted(path for path in tmp_path.rglob("*")) == before
+
+
+def test_folder_cache_of_another_data_directory_is_ignored(tmp_path):
+    """A cache saved for another VS Code data directory is not trusted"""
+    storage, order = make_storage(tmp_path, 1)
+    write_workspace(storage, order[0], make_folder(tmp_path / "proj"))
+    cache_dir = make_folder(tmp_path / "cache")
+    mtime = os.stat(storage / order[0] / "workspace.json").st_mtime_ns
+    (cache_dir / "workspace_folders.json").write_text(json.dumps({
+        "vscode_data_dir": str(tmp_path / "Other"),
+        "workspaces": {order[0]: ["file:///elsewhere", mtime]},
+    }))
+
+    workspaces = make_finder(tmp_path, cache_dir=cache_dir).list_all_workspaces()
+
+    assert workspaces == [{"id": order[0], "path": str(tmp_path / "proj")}]
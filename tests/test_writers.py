@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming session writers
+
+The output of each writer is read back with the standard json and csv
+modules, so hand-built formatting has to produce valid documents.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+
+from copilot_chat_exporter.core.models import ChatMessage, ChatSession
+from copilot_chat_exporter.core.writers import (
+    CsvSessionWriter,
+    JsonSessionWriter,
+    JsonlSessionWriter,
+    MarkdownSessionWriter,
+)
+
+
+# Content that needs quoting or escaping in every format
+TRICKY_CONTENT = 'She said "hi", then left\r\nNew line\rCarriage\nEnd'
+
+
+def make_session(session_id, title, contents):
+    """Build a session with one message per content string"""
+    timestamp = datetime(2024, 1, 15, 9, 0, 0)
+    return ChatSession(
+        session_id=session_id,
+        title=title,
+        created_at=timestamp,
+        updated_at=timestamp,
+        messages=[
+            ChatMessage(
+                id=f"msg_{i}",
+                timestamp=timestamp,
+                role="user" if i % 2 == 0 else "assistant",
+                content=content,
+                session_id=session_id,
+            )
+            for i, content in enumerate(contents)
+        ],
+    )
+
+
+def make_sessions():
+    """Several sessions, including one without messages"""
+    return [
+        make_session("session_1", 'Quotes "and", commas', [TRICKY_CONTENT, "plain"]),
+        make_session("session_2", None, []),
+        make_session("session_3", "Third", ["a,b", '""', "\n"]),
+    ]
+
+
+def write_all(writer_class, sessions):
+    """Write sessions through a writer into memory and return the output"""
+    buffer = io.StringIO()
+    with writer_class(buffer) as writer:
+        for session in sessions:
+            writer.write(session)
+    return buffer.getvalue()
+
+
+def test_json_writer_empty():
+    """An export without sessions is still a complete JSON document"""
+    data = json.loads(write_all(JsonSessionWriter, []))
+
+    assert data["sessions"] == []
+    assert data["total_sessions"] == 0
+    assert data["total_messages"] == 0
+
+
+def test_json_writer_single_session():
+    """One session is nested without a stray separator"""
+    session = make_session("session_1", "Only", [TRICKY_CONTENT])
+    data = json.loads(write_all(JsonSessionWriter, [session]))
+
+    assert [s["session_id"] for s in data["sessions"]] == ["session_1"]
+    assert data["sessions"][0]["messages"][0]["content"] == TRICKY_CONTENT
+    assert data["total_sessions"] == 1
+    assert data["total_messages"] == 1
+
+
+def test_json_writer_multiple_sessions():
+    """Several sessions are separated and keep their content intact"""
+    sessions = make_sessions()
+    data = json.loads(write_all(JsonSessionWriter, sessions))
+
+    assert [s["session_id"] for s in data["sessions"]] == ["session_1", "session_2", "session_3"]
+    assert data["sessions"][0]["title"] == 'Quotes "and", commas'
+    assert data["sessions"][0]["messages"][0]["content"] == TRICKY_CONTENT
+    assert data["sessions"][1]["messages"] == []
+    assert data["total_sessions"] == 3
+    assert data["total_messages"] == 5
+
+
+def test_jsonl_writer_multiple_sessions():
+    """Every session is one JSON object on its own line"""
+    sessions = make_sessions()
+    lines = write_all(JsonlSessionWriter, sessions).splitlines()
+
+    assert len(lines) == 3
+    data = [json.loads(line) for line in lines]
+    assert [s["session_id"] for s in data] == ["session_1", "session_2", "session_3"]
+    assert data[0]["messages"][0]["content"] == TRICKY_CONTENT
+
+
+def test_jsonl_writer_empty():
+    """An export without sessions writes nothing"""
+    assert write_all(JsonlSessionWriter, []) == ""
+
+
+def test_csv_writer_empty():
+    """An export without sessions only has the header row"""
+    rows = list(csv.reader(io.StringIO(write_all(CsvSessionWriter, []), newline='')))
+
+    assert rows == [["Session ID", "Session Title", "Message ID", "Timestamp", "Role", "Content"]]
+
+
+def test_csv_writer_multiple_sessions():
+    """Fields with quotes, commas and line breaks read back as written"""
+    sessions = make_sessions()
+    output = write_all(CsvSessionWriter, sessions)
+    rows = list(csv.reader(io.StringIO(output, newline='')))
+
+    # Line breaks in the content are written as literal \n and \r, so every
+    # message stays on one line
+    assert len(output.split('\r\n')) == 1 + 5 + 1
+    assert rows[0] == ["Session ID", "Session Title", "Message ID", "Timestamp", "Role", "Content"]
+    assert rows[1:] == [
+        ["session_1", 'Quotes "and", commas', "msg_0", "2024-01-15T09:00:00", "user",
+         'She said "hi", then left\\r\\nNew line\\rCarriage\\nEnd'],
+        ["session_1", 'Quotes "and", commas', "msg_1", "2024-01-15T09:00:00", "assistant", "plain"],
+        ["session_3", "Third", "msg_0", "2024-01-15T09:00:00", "user", "a,b"],
+        ["session_3", "Third", "msg_1", "2024-01-15T09:00:00", "assistant", '""'],
+        ["session_3", "Third", "msg_2", "2024-01-15T09:00:00", "user", "\\n"],
+    ]
+
+
+def test_markdown_writer_empty():
+    """An export without sessions has the header and zero totals"""
+    output = write_all(MarkdownSessionWriter, [])
+
+    assert output.startswith("# Copilot Chat History Export\n\nExported on: ")
+    assert "## Session" not in output
+    assert output.endswith("Total Sessions: 0\nTotal Messages: 0\n")
+
+
+def test_markdown_writer_multiple_sessions():
+    """Sessions are numbered, messages get one block each and the totals come last"""
+    sessions = make_sessions()
+    output = write_all(MarkdownSessionWriter, sessions)
+
+    assert output.startswith("# Copilot Chat History Export\n\nExported on: ")
+
+    # Sessions without a title are headed by their ID
+    assert output.count("## Session ") == 3
+    assert (
+        "## Session 1: Quotes \"and\", commas\n\n"
+        "**Created:** 2024-01-15 09:00:00\n"
+        "**Messages:** 2\n\n"
+    ) in output
+    assert "## Session 2: session_2\n\n**Created:** 2024-01-15 09:00:00\n**Messages:** 0\n\n" in output
+    assert "## Session 3: Third\n" in output
+
+    assert output.count("\n---\n\n") == 5
+    assert (
+        "### 🧑 User\n*2024-01-15 09:00:00*\n\n"
+        f"{TRICKY_CONTENT}\n\n---\n\n"
+        "### 🤖 Assistant\n*2024-01-15 09:00:00*\n\n"
+        "plain\n\n---\n\n"
+        "## Session 2: session_2"
+    ) in output
+
+    assert output.endswith("---\n\nTotal Sessions: 3\nTotal Messages: 5\n")